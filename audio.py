@@ -0,0 +1,158 @@
+"""Preloaded, pooled sound effects shared by both games.
+
+An AudioEngine is built from a table of sounds:
+
+    # name: (file, priority, voices, cooldown ms, volume, fallback tone)
+    SOUNDS = {"shoot": ("shoot.wav", 1, 3, 60, 0.6, (880, 220, 0.12, 0.0))}
+
+Every sound is decoded once on a background thread; a file that is
+missing (or will not decode) is replaced by its fallback tone, a sweep
+from one frequency to another over some seconds with a share of white
+noise mixed in, synthesized through pygame.sndarray. Until a sound is
+ready, playing it is a no-op, so a frame never waits on the disk.
+
+init_audio() starts the mixer first; without an audio device the engine
+stays silent.
+
+Effects play only on a pool of reserved mixer channels. A sound plays on
+at most ``voices`` channels at once and not again within its cooldown;
+when the pool is full it takes the channel of the oldest sound of lower
+(or equal) priority, and is dropped if there is none.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+RESERVED_CHANNELS = 8
+# Sample layout of each pygame.mixer size: (dtype, silence, full scale)
+SAMPLE_FORMATS = {
+    8: (np.uint8, 128, 127),
+    -8: (np.int8, 0, 127),
+    16: (np.uint16, 32768, 32767),
+    -16: (np.int16, 0, 32767),
+    -32: (np.int32, 0, 2**31 - 1),
+    32: (np.float32, 0, 1),
+}
+
+
+def synthesize(start_hz, end_hz, seconds, noise):
+    """A decaying tone as a pygame Sound in the mixer's current format"""
+    rate, size, channels = pygame.mixer.get_init()
+    t = np.arange(int(rate * seconds)) / rate
+    frequency = np.linspace(start_hz, end_hz, len(t))
+    phase = 2 * np.pi * np.cumsum(frequency) / rate
+    wave = np.sign(np.sin(phase)) * (1 - noise)
+    if noise:
+        wave += np.random.default_rng(0).uniform(-1, 1, len(t)) * noise
+    wave *= np.linspace(1, 0, len(t)) * 0.5  # fade out, and leave headroom
+
+    dtype, silence, scale = SAMPLE_FORMATS[size]
+    samples = (silence + wave * scale).astype(dtype)
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+def init_audio(directory=Path("sounds")):
+    """Start the mixer; return False if there is no audio device to start"""
+    directory.mkdir(exist_ok=True)
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return False
+    return True
+
+
+class AudioEngine:
+    """Sound effects on reserved channels with priorities, voice caps and cooldowns.
+
+    Does nothing at all if the mixer has not been started, so games run
+    silent without an audio device (or under a headless harness).
+    """
+
+    def __init__(self, sounds, directory=Path("sounds"), channels=RESERVED_CHANNELS):
+        self.specs = sounds
+        self.sounds = {}
+        self.enabled = bool(pygame.mixer.get_init())
+        if not self.enabled:
+            self.loader = None
+            return
+
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        # What each channel last played: (priority, start time, name)
+        self.playing = [(0, 0.0, None)] * channels
+        self.last_played = {}
+
+        self.loader = threading.Thread(target=self.load, args=(Path(directory),), daemon=True)
+        self.loader.start()
+
+    def load(self, directory):
+        """Decode every sound, falling back to its tone; runs on the loader thread"""
+        for name, (file, _, _, _, volume, tone) in self.specs.items():
+            path = directory / file
+            try:
+                sound = pygame.mixer.Sound(file=str(path)) if path.exists() else synthesize(*tone)
+            except Exception:
+                # Whatever is wrong with one file, the rest still load
+                sound = synthesize(*tone)
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+
+    def play(self, name, volume=1.0):
+        """Start a sound if its cap, cooldown and the channel pool allow it; return its channel or None"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        _, priority, voices, cooldown, _, _ = self.specs[name]
+        now = time.perf_counter()
+        if (now - self.last_played.get(name, -cooldown)) * 1000 < cooldown:
+            return None
+
+        index = None
+        victim = None
+        busy_voices = 0
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                if index is None:
+                    index = i
+                continue
+            playing_priority, started, playing_name = self.playing[i]
+            if playing_name == name:
+                busy_voices += 1
+            # Steal the oldest of the lowest-priority sounds
+            if playing_priority <= priority and (victim is None or self.playing[i][:2] < self.playing[victim][:2]):
+                victim = i
+        if busy_voices >= voices:
+            return None
+        if index is None:
+            index = victim
+            if index is None:
+                return None
+
+        channel = self.channels[index]
+        channel.set_volume(volume)
+        channel.play(sound)
+        self.playing[index] = (priority, now, name)
+        self.last_played[name] = now
+        return channel
+
+    def play_music(self, path):
+        """Stream background music on a loop, if the file is there"""
+        if self.enabled and Path(path).exists():
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1)  # Loop indefinitely
+
+    def close(self):
+        """Wait for the loader and stop everything, before the mixer is shut down"""
+        if self.loader is None:
+            return
+        self.loader.join()
+        for channel in self.channels:
+            channel.stop()
+        pygame.mixer.music.stop()
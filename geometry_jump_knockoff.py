@@ -2,104 +2,233 @@ import pygame
 import random
 import math
 import time
-import pygame.gfxdraw
 import pygame.mixer
-from pygame import Vector2
-import os
+import numpy as np
 from pathlib import Path
 
+from audio import AudioEngine, init_audio
+from lru import LRUCache
+
 # Game constants
 WIDTH = 800
 HEIGHT = 600
 
-# Initialize Pygame with better graphics
-pygame.init()
-pygame.mixer.init()
-pygame.display.set_caption("Geometry Rush")
-
 # Set up better graphics
 FLAGS = pygame.DOUBLEBUF | pygame.HWSURFACE
-screen = pygame.display.set_mode((WIDTH, HEIGHT), FLAGS)
-screen.set_alpha(None)  # Improves performance
 
-# Load and set up sounds
 SOUND_DIR = Path("sounds")
-SOUND_DIR.mkdir(exist_ok=True)
-
-class SoundManager:
-    def __init__(self):
-        self.sounds = {
-            'jump': pygame.mixer.Sound('sounds/jump.wav') if os.path.exists('sounds/jump.wav') else None,
-            'death': pygame.mixer.Sound('sounds/death.wav') if os.path.exists('sounds/death.wav') else None,
-            'portal': pygame.mixer.Sound('sounds/portal.wav') if os.path.exists('sounds/portal.wav') else None,
-            'music': 'sounds/background.mp3' if os.path.exists('sounds/background.mp3') else None
-        }
-        
-    def play(self, sound_name, volume=1.0):
-        if self.sounds.get(sound_name):
-            self.sounds[sound_name].set_volume(volume)
-            self.sounds[sound_name].play()
+MUSIC = SOUND_DIR / "background.mp3"
+# name: (file, priority, voices, cooldown ms, volume, fallback tone)
+SOUNDS = {
+    'jump': ('jump.wav', 1, 2, 50, 0.6, (300, 700, 0.1, 0.0)),
+    'portal': ('portal.wav', 2, 1, 200, 0.8, (400, 1200, 0.3, 0.0)),
+    'death': ('death.wav', 3, 1, 500, 1.0, (220, 50, 0.5, 0.6)),
+}
+
+# Importing this module has no side effects; main() (or a harness) opens
+# the window and the mixer through these when it needs them
+screen = None
+
+def init_display():
+    """Open the game window and return its surface"""
+    global screen
+    pygame.init()  # also starts the clock pygame.time.get_ticks() reads
+    pygame.display.set_caption("Geometry Rush")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), FLAGS)
+    screen.set_alpha(None)  # Improves performance
+    return screen
+
+ATLAS_MAX_RADIUS = 12  # larger particles are drawn at this radius
+ALPHA_BUCKETS = 8  # fade steps of a glowing particle over its lifetime
+
+class ParticleAtlas:
+    """Every particle sprite a ParticleSystem can draw, on one surface"""
+
+    shared = {}  # glow: atlas
+
+    def __init__(self, glow, buckets=ALPHA_BUCKETS):
+        self.glow = glow
+        self.buckets = buckets if glow else 1
+        # One column per radius and one row per (color, alpha bucket), so a
+        # particle is a source rect and a system draws in one blits()
+        self.cell = 2 * ATLAS_MAX_RADIUS + 1
+        widths = 2 * np.arange(ATLAS_MAX_RADIUS + 1) + 1
+        self.x = np.concatenate(([0], np.cumsum(widths)[:-1]))  # left edge of each radius' column
+        self.width = int(widths.sum())
+        self.rows = {}  # color: row
+        self.surface = pygame.Surface((self.width, 0), pygame.SRCALPHA)
+
+    @classmethod
+    def get(cls, glow):
+        if glow not in cls.shared:
+            cls.shared[glow] = cls(glow)
+        return cls.shared[glow]
+
+    @classmethod
+    def prepare(cls, colors):
+        for glow in (True, False):
+            atlas = cls.get(glow)
+            for color in colors:
+                atlas.row(color)
+
+    def row(self, color):
+        """Row of color's sprites, rendering them the first time"""
+        color = tuple(int(c) for c in color)
+        if color not in self.rows:
+            self.rows[color] = len(self.rows)
+            surface = pygame.Surface((self.width, self.cell * self.buckets * len(self.rows)), pygame.SRCALPHA)
+            surface.blit(self.surface, (0, 0))
+            self.render(surface, color, self.rows[color])
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.surface = surface
+        return self.rows[color]
+
+    def render(self, surface, color, row):
+        top = row * self.buckets * self.cell
+        rgb = pygame.surfarray.pixels3d(surface)
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        rgb[:, top:top + self.buckets * self.cell] = color
+        for radius in range(1, ATLAS_MAX_RADIUS + 1):
+            size = 2 * radius + 1
+            if self.glow:
+                # Ring r of R covers distances up to r with opacity 100/255 * r/R;
+                # a pixel shows the rings at least as wide as its distance
+                ring_alpha = 100 / 255 * np.arange(1, radius + 1) / radius
+                clear = np.cumprod((1 - ring_alpha)[::-1])[::-1]  # left uncovered by rings r..R
+                offset = np.arange(size) - radius
+                distance = np.ceil(np.hypot(offset[:, None], offset[None, :]))
+                opacity = np.where(distance <= radius, 1 - clear[np.clip(distance, 1, radius).astype(int) - 1], 0)
+            else:
+                dot = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.circle(dot, color, (radius, radius), radius)
+                opacity = pygame.surfarray.array_alpha(dot) / 255
 
-    def play_music(self):
-        if self.sounds['music']:
-            pygame.mixer.music.load(self.sounds['music'])
-            pygame.mixer.music.play(-1)  # Loop indefinitely
+            left = self.x[radius]
+            for bucket in range(self.buckets):
+                y = top + bucket * self.cell
+                alpha[left:left + size, y:y + size] = opacity * 255 * (bucket + 1) / self.buckets
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-        self.surf = pygame.Surface((10, 10), pygame.SRCALPHA)
-        
-    def emit(self, pos, color, num_particles=10, speed_range=(2, 5), size_range=(2, 6)):
-        for _ in range(num_particles):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(*speed_range)
-            size = random.uniform(*size_range)
-            lifetime = random.randint(20, 40)
-            
-            self.particles.append({
-                'pos': Vector2(pos),
-                'vel': Vector2(math.cos(angle), math.sin(angle)) * speed,
-                'color': color,
-                'size': size,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime
-            })
+    """A fixed number of particles kept as parallel NumPy arrays"""
+
+    def __init__(self, capacity=128, glow=False):
+        self.glow = glow
+        self.atlas = ParticleAtlas.get(glow)
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.ones(capacity)
+        self.size = np.zeros(capacity)
+        self.shrink = np.zeros(capacity)  # size lost per update
+        self.gravity = np.zeros(capacity)  # added to vertical velocity per update
+        self.sprite_row = np.zeros(capacity, dtype=int)  # color's row in the atlas
+        self.alive = np.zeros(capacity, dtype=bool)  # slots in use; spawn() drops what does not fit
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def spawn(self, x, y, vel, lifetime, size, color, shrink=0, gravity=0):
+        """Start len(vel) particles at (x, y); lifetime, size and color may be per particle"""
+        slots = np.flatnonzero(~self.alive)[:len(vel)]
+        count = len(slots)
+        self.pos[slots] = (x, y)
+        self.vel[slots] = vel[:count]
+        self.lifetime[slots] = lifetime if np.isscalar(lifetime) else lifetime[:count]
+        self.max_lifetime[slots] = self.lifetime[slots]
+        self.size[slots] = size if np.isscalar(size) else size[:count]
+        if len(np.shape(color)) == 1:
+            self.sprite_row[slots] = self.atlas.row(color)
+        else:
+            colors, which = np.unique(color[:count], axis=0, return_inverse=True)
+            self.sprite_row[slots] = np.array([self.atlas.row(c) for c in colors])[which]
+        self.shrink[slots] = shrink
+        self.gravity[slots] = gravity
+        self.alive[slots] = True
+
+    def emit(self, pos, color, num_particles=10, speed_range=(2, 5), size_range=(2, 6), lifetime=None, gravity=0):
+        """Scatter particles from pos in every direction, living 20 to 40 updates unless lifetime is given"""
+        # One draw for everything: a few particles a frame is all overhead otherwise
+        angle, speed, size, age = self.rng.random((4, num_particles))
+        angle *= math.pi * 2
+        speed = speed_range[0] + speed * (speed_range[1] - speed_range[0])
+        vel = np.empty((num_particles, 2))
+        np.multiply(np.cos(angle), speed, out=vel[:, 0])
+        np.multiply(np.sin(angle), speed, out=vel[:, 1])
+        if lifetime is None:
+            lifetime = np.floor(20 + age * 21)
+        size = size_range[0] + size * (size_range[1] - size_range[0])
+        self.spawn(pos[0], pos[1], vel, lifetime, size, color, gravity=gravity)
+
+    def spray(self, x, y, color, num_particles):
+        """Particles thrown up and sideways that shrink as they go"""
+        rng = self.rng
+        vel = np.column_stack((rng.uniform(-2, 2, num_particles), rng.uniform(-5, -1, num_particles)))
+        self.spawn(x, y, vel, 30, rng.integers(3, 7, num_particles), color, shrink=0.1)
+
+    def clear(self):
+        self.alive[:] = False
+
+    def update(self):
+        # Dead slots are stepped too; it is cheaper than masking, and
+        # spawn() overwrites them anyway
+        self.pos += self.vel
+        self.vel[:, 1] += self.gravity
+        self.lifetime -= 1
+        self.size -= self.shrink
+        np.maximum(self.size, 0, out=self.size)
+        self.alive &= self.lifetime > 0
+
+    def draw(self, screen, camera_offset=(0, 0)):
+        atlas = self.atlas
+        live = np.flatnonzero(self.alive)
+        # A glow reaches out to twice the particle's size
+        radius = (self.size[live] * 2 if self.glow else self.size[live]).astype(int)
+        live = live[radius > 0]
+        radius = np.minimum(radius[radius > 0], ATLAS_MAX_RADIUS)
+        if self.glow:
+            # Fade with age: the last bucket is full strength, the first is nearly gone
+            bucket = np.ceil(self.lifetime[live] / self.max_lifetime[live] * atlas.buckets).astype(int) - 1
+            bucket = np.clip(bucket, 0, atlas.buckets - 1)
+        else:
+            bucket = 0
+
+        rects = np.empty((len(live), 6), dtype=int)
+        rects[:, :2] = (self.pos[live] - camera_offset).astype(int) - radius[:, None]
+        rects[:, 2] = atlas.x[radius]
+        rects[:, 3] = (self.sprite_row[live] * atlas.buckets + bucket) * atlas.cell
+        rects[:, 4] = rects[:, 5] = 2 * radius + 1
+        surface = atlas.surface
+        screen.blits([(surface, (x, y), (ax, ay, w, h)) for x, y, ax, ay, w, h in rects.tolist()], doreturn=False)
 
     def update_and_draw(self, screen, camera_offset=(0, 0)):
-        alive_particles = []
-        for p in self.particles:
-            p['pos'] += p['vel']
-            p['lifetime'] -= 1
-            
-            if p['lifetime'] > 0:
-                alpha = int(255 * (p['lifetime'] / p['max_lifetime']))
-                color = (*p['color'], alpha)
-                
-                pos = (int(p['pos'].x - camera_offset[0]), 
-                      int(p['pos'].y - camera_offset[1]))
-                
-                # Draw glow effect
-                for radius in range(int(p['size'] * 2), 0, -1):
-                    alpha = int(100 * (radius / (p['size'] * 2)))
-                    pygame.gfxdraw.filled_circle(screen, 
-                                              pos[0], pos[1], 
-                                              radius, 
-                                              (*p['color'], alpha))
-                
-                alive_particles.append(p)
-                
-        self.particles = alive_particles
+        self.update()
+        self.draw(screen, camera_offset)
 
 class GlowEffect:
+    """Additive glows, each rendered once and kept in a bounded LRU cache"""
+    CACHE_SIZE = 64
+    INTENSITY_STEPS = 16  # intensity is rounded to these, so near-equal glows share a surface
+    cache = LRUCache(CACHE_SIZE)
+
+    @classmethod
+    def glow_surface(cls, color, radius, intensity):
+        key = (tuple(color), radius, round(intensity * cls.INTENSITY_STEPS))
+        return cls.cache.get(key, lambda: cls.render_glow(color, radius, key[2] / cls.INTENSITY_STEPS))
+
     @staticmethod
-    def draw_glow(surface, color, pos, radius, intensity=1):
+    def render_glow(color, radius, intensity):
         glow_surf = pygame.Surface((radius * 4, radius * 4), pygame.SRCALPHA)
         for i in range(radius, 0, -2):
             alpha = int(intensity * (i / radius) * 255)
             pygame.draw.circle(glow_surf, (*color, alpha), 
                             (radius * 2, radius * 2), i)
-        surface.blit(glow_surf, (pos[0] - radius * 2, pos[1] - radius * 2), 
+        return glow_surf
+
+    @classmethod
+    def draw_glow(cls, surface, color, pos, radius, intensity=1):
+        surface.blit(cls.glow_surface(color, radius, intensity), (pos[0] - radius * 2, pos[1] - radius * 2), 
                     special_flags=pygame.BLEND_ADD)
 
 # Colors
@@ -124,27 +253,27 @@ GREEN = (0, 255, 0)
 GOLD = (255, 215, 0)
 SILVER = (192, 192, 192)
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.lifetime = 30
-        self.velocity = [random.uniform(-2, 2), random.uniform(-5, -1)]
-        self.size = random.randint(3, 6)
+# Every color particles are emitted in, for ParticleAtlas.prepare()
+PARTICLE_COLORS = [CYAN, BLUE, GOLD, SILVER, WHITE, ORANGE, PURPLE, GREEN]
 
-    def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.lifetime -= 1
-        self.size = max(0, self.size - 0.1)
+class TextCache:
+    """Fonts opened once per size, and a bounded LRU of rendered text"""
+    CACHE_SIZE = 128
+    fonts = {}  # size: font
+    cache = LRUCache(CACHE_SIZE)
 
-    def draw(self, screen, camera_offset):
-        if self.lifetime > 0:
-            pygame.draw.circle(screen, self.color, 
-                             (int(self.x - camera_offset[0]), 
-                              int(self.y - camera_offset[1])), 
-                             int(self.size))
+    @classmethod
+    def font(cls, size):
+        font = cls.fonts.get(size)
+        if font is None:
+            font = cls.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    @classmethod
+    def render(cls, string, size, color):
+        # Font rendering ignores alpha, so it must not split the cache
+        key = (string, size, tuple(color[:3]))
+        return cls.cache.get(key, lambda: cls.font(size).render(string, True, key[2]))
 
 class Camera:
     def __init__(self):
@@ -224,12 +353,9 @@ class Settings:
             color = (40 + i * 2, 40 + i * 2, 80 + i * 2)
             pygame.draw.rect(screen, color, (0, i * 30, WIDTH, 30))
 
-        title_font = pygame.font.Font(None, 74)
-        option_font = pygame.font.Font(None, 50)
-        
         # Draw title with shadow
-        title = title_font.render("Settings", True, WHITE)
-        title_shadow = title_font.render("Settings", True, (40, 40, 40))
+        title = TextCache.render("Settings", 74, WHITE)
+        title_shadow = TextCache.render("Settings", 74, (40, 40, 40))
         title_rect = title.get_rect(center=(WIDTH/2, 100))
         screen.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
         screen.blit(title, title_rect)
@@ -248,7 +374,7 @@ class Settings:
             else:
                 text = option
 
-            option_text = option_font.render(text, True, color)
+            option_text = TextCache.render(text, 50, color)
             if selected:
                 pygame.draw.rect(screen, color, (WIDTH/4, y_position - 5, WIDTH/2, 50), 2)
             
@@ -259,7 +385,7 @@ class Game:
     def __init__(self):
         self.state = GameState.MAIN_MENU
         self.loading_progress = 0
-        self.particles = []
+        self.particles = ParticleSystem(512)
         self.camera = Camera()
         self.player = Player()
         self.game_objects = []
@@ -274,7 +400,7 @@ class Game:
         self.respawn_duration = 60
         self.respawn_animation = 0
         self.death_time = 0
-        self.game_over_particles = []
+        self.game_over_particles = ParticleSystem(64)
 
     def generate_zones(self):
         zones = []
@@ -309,9 +435,8 @@ class Game:
                                (bar_x, HEIGHT/2 - 15, bar_width + 1, 30))
 
         # Draw loading text with animation
-        font = pygame.font.Font(None, 50)
         dots = "." * ((pygame.time.get_ticks() // 500) % 4)
-        loading_text = font.render(f"Loading{dots}", True, WHITE)
+        loading_text = TextCache.render(f"Loading{dots}", 50, WHITE)
         screen.blit(loading_text, (WIDTH/2 - loading_text.get_width()/2, HEIGHT/2 + 50))
         
         if progress >= 100:
@@ -327,18 +452,15 @@ class Game:
             y = (i * 40 + t * 50) % HEIGHT
             pygame.draw.line(screen, (40, 40, 80), (0, y), (WIDTH, y), 2)
 
-        title_font = pygame.font.Font(None, 100)
-        option_font = pygame.font.Font(None, 60)
-
         # Draw title with glow effect
         title = "Cubic Hopper"
         for offset in range(5, 0, -1):
             color = (0, 100 + offset * 30, 255 - offset * 30)
-            title_text = title_font.render(title, True, color)
+            title_text = TextCache.render(title, 100, color)
             title_rect = title_text.get_rect(center=(WIDTH/2, HEIGHT/4))
             screen.blit(title_text, (title_rect.x + offset, title_rect.y + offset))
         
-        title_text = title_font.render(title, True, WHITE)
+        title_text = TextCache.render(title, 100, WHITE)
         title_rect = title_text.get_rect(center=(WIDTH/2, HEIGHT/4))
         screen.blit(title_text, title_rect)
 
@@ -346,7 +468,7 @@ class Game:
         for i, option in enumerate(self.menu_options):
             selected = i == self.menu_selection
             color = CYAN if selected else WHITE
-            text = option_font.render(option, True, color)
+            text = TextCache.render(option, 60, color)
             text_rect = text.get_rect(center=(WIDTH/2, HEIGHT/2 + i * 80))
             
             if selected:
@@ -370,8 +492,8 @@ class Game:
     def start_new_game(self):
         self.player = Player()
         self.game_objects = generate_level_segment(800, 0)
-        self.particles = []
-        self.game_over_particles = []
+        self.particles.clear()
+        self.game_over_particles.clear()
         self.score = 0
         self.respawn_timer = 60
         self.respawn_duration = 60
@@ -391,58 +513,40 @@ class Game:
 
         # Create game over particles if needed
         if len(self.game_over_particles) == 0:
-            for _ in range(50):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(2, 5)
-                color = random.choice([GOLD, SILVER, WHITE])
-                self.game_over_particles.append({
-                    'x': WIDTH/2,
-                    'y': HEIGHT/2,
-                    'vx': math.cos(angle) * speed,
-                    'vy': math.sin(angle) * speed,
-                    'color': color,
-                    'size': random.randint(2, 4)
-                })
+            particles = self.game_over_particles
+            colors = np.array([GOLD, SILVER, WHITE])[particles.rng.integers(3, size=50)]
+            # They fall until the next game rather than fading out
+            particles.emit((WIDTH/2, HEIGHT/2), colors, 50, size_range=(2, 5), lifetime=math.inf, gravity=0.1)
 
         # Update and draw particles
-        for particle in self.game_over_particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.1  # Gravity
-            pygame.draw.circle(screen, particle['color'], 
-                             (int(particle['x']), int(particle['y'])), 
-                             particle['size'])
+        self.game_over_particles.update_and_draw(screen)
 
         # Draw game over text with animation
-        title_font = pygame.font.Font(None, 100)
-        score_font = pygame.font.Font(None, 74)
-        
         # Animated title
         title_y = HEIGHT/3 - 50 * (1 - animation_progress)
-        game_over_text = title_font.render("Game Over!", True, WHITE)
+        game_over_text = TextCache.render("Game Over!", 100, WHITE)
         text_rect = game_over_text.get_rect(center=(WIDTH/2, title_y))
         
         # Add glow effect
         for offset in range(3):
-            glow_surface = title_font.render("Game Over!", True, (50, 50, 150))
+            glow_surface = TextCache.render("Game Over!", 100, (50, 50, 150))
             glow_rect = glow_surface.get_rect(center=(WIDTH/2 + offset, title_y + offset))
             screen.blit(glow_surface, glow_rect)
         screen.blit(game_over_text, text_rect)
 
         # Score display with animation
         score_y = HEIGHT/2 + 50 * animation_progress
-        score_text = score_font.render(f"Score: {self.score}", True, GOLD)
-        high_score_text = score_font.render(f"Best: {self.high_score}", True, SILVER)
+        score_text = TextCache.render(f"Score: {self.score}", 74, GOLD)
+        high_score_text = TextCache.render(f"Best: {self.high_score}", 74, SILVER)
         
         screen.blit(score_text, score_text.get_rect(center=(WIDTH/2, score_y)))
         screen.blit(high_score_text, high_score_text.get_rect(center=(WIDTH/2, score_y + 60)))
 
         # Draw restart prompt with pulsing animation
         if time_since_death > 1000:  # Show after 1 second
-            prompt_font = pygame.font.Font(None, 50)
             pulse = (math.sin(time_since_death / 200) + 1) / 2  # Pulsing effect
             prompt_color = (255, 255, 255, int(128 + 127 * pulse))
-            prompt_text = prompt_font.render("Press SPACE to Restart", True, prompt_color)
+            prompt_text = TextCache.render("Press SPACE to Restart", 50, prompt_color)
             screen.blit(prompt_text, prompt_text.get_rect(center=(WIDTH/2, HEIGHT * 3/4)))
 
     def draw_respawn_animation(self, screen):
@@ -508,14 +612,13 @@ class Game:
                     self.player.x + self.player.size > obj.x):
                     self.player.apply_portal_effect(obj.type, obj.effects[obj.type]["multiplier"])
                     # Add particles
-                    for _ in range(10):
-                        self.particles.append(Particle(obj.x, obj.y, obj.color))
+                    self.particles.spray(obj.x, obj.y, obj.color, 10)
             elif isinstance(obj, Obstacle) and obj.type == "spike":
                 if (self.player.x < obj.x + obj.width and
                     self.player.x + self.player.size > obj.x and
                     self.player.y < obj.y + obj.height and
                     self.player.y + self.player.size > obj.y):
-                    self.particles.extend(self.player.die())
+                    self.player.die(self.particles)
 
             # Remove objects that are far behind
             if obj.x < self.player.x - WIDTH:
@@ -536,11 +639,13 @@ class Game:
             self.game_objects.extend(new_objects)
 
         # Update particles
-        self.particles = [p for p in self.particles if p.lifetime > 0]
-        for particle in self.particles:
-            particle.update()
+        self.particles.update()
 
 class Player:
+    ROTATION_STEPS = 90  # cube sprites per quarter turn
+    SPRITE_CACHE_SIZE = 2 * ROTATION_STEPS  # every angle at normal and shrunk size
+    sprites = LRUCache(SPRITE_CACHE_SIZE)
+
     def __init__(self):
         self.x = 100
         self.y = HEIGHT - 150
@@ -559,11 +664,28 @@ class Player:
         self.speed_multiplier = 1.0
         self.gravity_multiplier = 1.0
         self.size_multiplier = 1.0
-        self.particle_system = ParticleSystem()
+        self.particle_system = ParticleSystem(glow=True)
         self.trail_points = []
         self.glow_color = (0, 255, 255)
         self.glow_intensity = 1.0
 
+    @classmethod
+    def cube_sprite(cls, size, rotation):
+        """The cube of this size turned to rotation, rendered on first use"""
+        # The cube and its diagonals look the same a quarter turn on
+        step = round(rotation % 90 * cls.ROTATION_STEPS / 90) % cls.ROTATION_STEPS
+        return cls.sprites.get((size, step), lambda: cls.render_cube(size, step * 90 / cls.ROTATION_STEPS))
+
+    @staticmethod
+    def render_cube(size, angle):
+        cube_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(cube_surface, BLUE, (0, 0, size, size))
+        
+        # Add design to the cube
+        pygame.draw.line(cube_surface, CYAN, (0, 0), (size, size), 2)
+        pygame.draw.line(cube_surface, CYAN, (0, size), (size, 0), 2)
+        return pygame.transform.rotate(cube_surface, angle)
+
     def jump(self, boost=False):
         if not self.is_jumping or boost:
             self.velocity = self.jump_power * (2 if boost else 1)
@@ -607,9 +729,9 @@ class Player:
         if len(self.trail_points) > 10:
             self.trail_points.pop()
 
-    def die(self):
+    def die(self, particles):
         self.is_dead = True
-        return [Particle(self.x + self.size/2, self.y + self.size/2, BLUE) for _ in range(20)]
+        particles.spray(self.x + self.size/2, self.y + self.size/2, BLUE, 20)
 
     def apply_portal_effect(self, portal_type, multiplier):
         if portal_type == "speed":
@@ -637,16 +759,7 @@ class Player:
         GlowEffect.draw_glow(screen, self.glow_color, pos, int(self.size/1.5))
         
         # Draw player shape
-        # Create a surface for the cube
-        cube_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.rect(cube_surface, BLUE, (0, 0, self.size, self.size))
-        
-        # Add design to the cube
-        pygame.draw.line(cube_surface, CYAN, (0, 0), (self.size, self.size), 2)
-        pygame.draw.line(cube_surface, CYAN, (0, self.size), (self.size, 0), 2)
-        
-        # Rotate the surface
-        rotated_surface = pygame.transform.rotate(cube_surface, self.rotation)
+        rotated_surface = self.cube_sprite(self.size, self.rotation)
         new_rect = rotated_surface.get_rect(center=(self.x + self.size/2 - camera_offset[0], self.y + self.size/2 - camera_offset[1]))
         screen.blit(rotated_surface, new_rect)
 
@@ -808,13 +921,17 @@ def draw_background(screen, camera_offset, current_zone):
     pygame.draw.rect(screen, GROUND_COLOR, (0, HEIGHT - 100 - camera_offset[1], WIDTH, 100))
     pygame.draw.line(screen, WHITE, (0, HEIGHT - 100 - camera_offset[1]), (WIDTH, HEIGHT - 100 - camera_offset[1]), 2)
 
+def startup():
+    """Bring up the window, audio and a fresh Game; return (screen, game, sound_manager)"""
+    screen = init_display()
+    init_audio(SOUND_DIR)
+    ParticleAtlas.prepare(PARTICLE_COLORS)
+    return screen, Game(), AudioEngine(SOUNDS, SOUND_DIR)
+
 def main():
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    game = Game()
+    screen, game, sound_manager = startup()
     clock = pygame.time.Clock()
-    sound_manager = SoundManager()
-    sound_manager.play_music()
+    sound_manager.play_music(MUSIC)
 
     running = True
     while running:
@@ -868,12 +985,10 @@ def main():
             game.player.draw(screen, camera_offset)
             
             # Draw particles
-            for particle in game.particles:
-                particle.draw(screen, camera_offset)
+            game.particles.draw(screen, camera_offset)
 
             # Draw score
-            font = pygame.font.Font(None, 36)
-            score_text = font.render(f'Score: {game.score}', True, WHITE)
+            score_text = TextCache.render(f'Score: {game.score}', 36, WHITE)
             screen.blit(score_text, (10, 10))
         elif game.state == GameState.GAME_OVER:
             game.draw_game_over(screen)
@@ -884,6 +999,7 @@ def main():
         pygame.display.flip()
         clock.tick(60)
 
+    sound_manager.close()
     pygame.quit()
 
 if __name__ == "__main__":
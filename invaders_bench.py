@@ -0,0 +1,333 @@
+"""Benchmarks for Space Invaders.
+
+collisions, env and rewind drive invaders_core directly, and suite plays
+main.Game behind its HeadlessView. startup starts each game in a fresh
+interpreter on SDL's dummy video and audio drivers, so nothing here shows
+a window.
+
+    python invaders_bench.py collisions
+    python invaders_bench.py env
+    python invaders_bench.py rewind
+    python invaders_bench.py startup
+    python invaders_bench.py suite --save-baseline baseline.json
+    python invaders_bench.py suite --baseline baseline.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from invaders_core import (Formation, Rewind, Simulation, SpatialGrid, WavePattern, all_pairs_within,
+                           wave_pattern, ALIEN_DROP, BULLET_HIT_RADIUS, INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT,
+                           INVASION_Y, MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+from invaders_env import VecEnv, ACTIONS
+
+FORMATIONS = ((5, 11), (8, 16), (10, 22), (MAX_ALIEN_ROWS, MAX_ALIEN_COLS))  # up to the biggest that fits
+SHOT_COUNTS = (1, 16, 64, 256)
+ENV_COUNTS = (1, 16, 64, 256)
+
+# name: (Simulation options, ticks between forced restarts or None).
+# Only "restarts" may end a game; the rest have lives to spare, and a
+# formation about to invade is marched in again from the top, so they
+# time the game they are named after with the aliens on screen.
+SCENARIOS = {
+    "formation_5x11": (dict(lives=10**6), None),
+    "formation_max": (dict(rows=MAX_ALIEN_ROWS, cols=MAX_ALIEN_COLS, lives=10**6), None),
+    "projectiles": (dict(fire_cooldown=1, alien_fire_chance=1.0, lives=10**6), None),
+    "restarts": (dict(), 120),
+}
+LATENCY_PERCENTILES = (50, 90, 99)
+SUITE_TICKS = 3000
+SUITE_ROUNDS = 3
+REGRESSION_THRESHOLD = 0.10
+
+# Each startup script runs in a fresh interpreter, so module imports are
+# paid for again, and prints ms to finish importing and to the first
+# presented frame, both counted from its first line
+STARTUP_SCRIPTS = {
+    "invaders": """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.init_audio()
+game = main.Game(main.PygameView, seed=0)
+game.render()
+game.view.present()
+print((imported - start) * 1000, (time.perf_counter() - start) * 1000)
+""",
+    "geometry": """
+import time
+start = time.perf_counter()
+import geometry_jump_knockoff as geometry
+imported = time.perf_counter()
+screen, game, sound_manager = geometry.startup()
+game.draw_menu(screen)
+geometry.pygame.display.flip()
+print((imported - start) * 1000, (time.perf_counter() - start) * 1000)
+""",
+}
+STARTUP_RUNS = 5
+STARTUP_BUDGET_MS = 1000  # time to first frame, per game
+
+
+def best_time(func, repeat):
+    """Best wall time of func() over repeat runs, in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def bench_collisions(repeat=200, seed=0):
+    """Time one tick's shot/alien test, brute force against the grid.
+
+    Shots are scattered over the formation's bounding box and a quarter
+    of the aliens are dead, roughly what a game in progress looks like.
+    """
+    rng = np.random.default_rng(seed)
+    print(f"{'aliens':>7} {'shots':>6} {'brute us':>10} {'grid us':>10}")
+
+    for rows, cols in FORMATIONS:
+        formation = Formation(rows, cols)
+        for index in rng.choice(len(formation.alive), len(formation.alive) // 4, replace=False):
+            formation.kill(index)
+        targets = np.flatnonzero(formation.alive)
+
+        grid = SpatialGrid.covering(formation.layout, BULLET_HIT_RADIUS)
+        grid.build(formation.layout, np.arange(len(formation.layout)))
+        origin = (formation.origin_x, formation.origin_y)
+        low = formation.pos.min(axis=0)
+        high = formation.pos.max(axis=0)
+
+        for shots in SHOT_COUNTS:
+            points = rng.uniform(low, high, (shots, 2))
+
+            def brute():
+                all_pairs_within(points, formation.pos, targets, BULLET_HIT_RADIUS)
+
+            def gridded():
+                shot_idx, alien_idx = grid.pairs_within(points - origin, BULLET_HIT_RADIUS)
+                live = formation.alive[alien_idx]
+                return shot_idx[live], alien_idx[live]
+
+            print(f"{len(targets):>7} {shots:>6} {best_time(brute, repeat):>10.1f} "
+                  f"{best_time(gridded, repeat):>10.1f}")
+
+
+def bench_env(steps=2000, seed=0):
+    """Environment steps per second on one core with random actions.
+
+    One step of a VecEnv with n games counts as n environment steps; the
+    process is single threaded, so this is the per-core figure to
+    multiply by the worker count.
+    """
+    print(f"{'envs':>5} {'env steps/s':>12} {'episodes':>9}")
+    for num_envs in ENV_COUNTS:
+        env = VecEnv(num_envs, seed=seed)
+        env.reset()
+        actions = env.rng.integers(ACTIONS, size=(steps, num_envs))
+        episodes = 0
+        start = time.perf_counter()
+        for tick_actions in actions:
+            episodes += len(env.step(tick_actions)[3])
+        elapsed = time.perf_counter() - start
+        print(f"{num_envs:>5} {steps * num_envs / elapsed:>12.0f} {episodes:>9}")
+
+
+def bench_rewind(repeat=200, seed=0):
+    """Cost of one rewind snapshot and one restore, per formation size"""
+    print(f"{'aliens':>7} {'snapshot us':>12} {'rewind us':>10} {'buffer MiB':>11}")
+    for rows, cols in FORMATIONS:
+        sim = Simulation(rows, cols, seed=seed)
+        rewind = Rewind(sim)
+        for _ in range(rewind.capacity):
+            sim.step(INPUT_FIRE)
+            rewind.snapshot()
+
+        def rewind_once():
+            rewind.count = rewind.capacity
+            rewind.rewind()
+
+        print(f"{rows * cols:>7} {best_time(rewind.snapshot, repeat):>12.1f} "
+              f"{best_time(rewind_once, repeat):>10.1f} {rewind.nbytes / 2**20:>11.1f}")
+
+
+def bench_startup(runs=STARTUP_RUNS, budget=STARTUP_BUDGET_MS):
+    """Import and time-to-first-frame of each game in a fresh process; return False if over budget.
+
+    SDL's dummy video and audio drivers stand in for a window and a
+    sound card, so this measures our own startup work, not the desktop's.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    print(f"{'game':<10} {'import ms':>10} {'first frame ms':>15} {'budget ms':>10}")
+    within = True
+    for name, script in STARTUP_SCRIPTS.items():
+        timings = []
+        for _ in range(runs):
+            # The scripts import the games, so they run from the repository
+            output = subprocess.run([sys.executable, "-c", script], env=env, cwd=Path(__file__).resolve().parent,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append([float(value) for value in output.split()[-2:]])
+        imported, first_frame = np.min(timings, axis=0)
+        within &= first_frame <= budget
+        print(f"{name:<10} {imported:>10.1f} {first_frame:>15.1f} {budget:>10}"
+              f"{'' if first_frame <= budget else '  OVER BUDGET'}")
+    return within
+
+
+def sweep(tick):
+    """Scripted input: keep firing while sweeping across the screen"""
+    return INPUT_FIRE | (INPUT_LEFT if (tick // 90) % 2 else INPUT_RIGHT)
+
+
+def play(game, ticks, restart_every, latencies=None):
+    """Run ``ticks`` Game.update() calls, timing each one into latencies if given.
+
+    Raises RuntimeError if the game ends without restart_every asking for
+    it, or if the formation gets below INVASION_Y.
+    """
+    clock = time.perf_counter_ns
+    formation = game.sim.formation
+    full = WavePattern(wave_pattern("full", formation.rows, formation.cols))
+    for tick in range(ticks):
+        game.view.held = sweep(tick)
+        if game.game_over and not restart_every:
+            raise RuntimeError(f"game over at tick {tick}; the scenario would be timing restarts")
+        if formation.bottom < INVASION_Y:
+            raise RuntimeError(f"formation invaded at tick {tick}; the scenario would be timing it off screen")
+        start = clock()
+        # A restart is charged to the tick that follows it, and so is a new formation
+        if game.game_over or (restart_every and tick and tick % restart_every == 0):
+            game.show_game_over()
+            game.reset_game()
+        elif formation.bottom - ALIEN_DROP < INVASION_Y:
+            # One more drop would invade; march a full formation in from the top instead
+            formation.activate(full, speed=formation.speed)
+        game.update()
+        if latencies is not None:
+            latencies[tick] = clock() - start
+
+
+def run_scenario(name, ticks=SUITE_TICKS, rounds=SUITE_ROUNDS, seed=0):
+    """Ticks per second, per-tick latency percentiles (us) and peak traced memory (KiB).
+
+    The same seeded game is timed ``rounds`` times and the fastest round
+    is reported, to keep noise from the rest of the machine out of it.
+    """
+    from main import Game, HeadlessView
+
+    sim_options, restart_every = SCENARIOS[name]
+    latencies = np.zeros(ticks, dtype=np.int64)
+    result = None
+    for _ in range(rounds):
+        game = Game(HeadlessView, seed, rewind_seconds=0, **sim_options)
+        play(game, ticks, restart_every, latencies)
+        ticks_per_s = ticks / (latencies.sum() / 1e9)
+        if result is None or ticks_per_s > result["ticks_per_s"]:
+            result = {"ticks_per_s": ticks_per_s}
+            for p, value in zip(LATENCY_PERCENTILES, np.percentile(latencies, LATENCY_PERCENTILES) / 1000):
+                result[f"p{p}_us"] = value
+
+    # Memory gets its own run, since tracing slows everything down
+    tracemalloc.start()
+    game = Game(HeadlessView, seed, rewind_seconds=0, **sim_options)
+    play(game, ticks, restart_every)
+    result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Names of metrics that got worse than baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric, value in result.items():
+            if metric not in old:
+                continue
+            # Throughput should not drop; latency and memory should not grow
+            if metric == "ticks_per_s":
+                change = old[metric] / value - 1
+            else:
+                change = value / old[metric] - 1
+            if change > threshold:
+                regressions.append(f"{name} {metric}: {old[metric]:.1f} -> {value:.1f} ({change:+.0%})")
+    return regressions
+
+
+def bench_suite(scenarios, ticks=SUITE_TICKS, rounds=SUITE_ROUNDS, baseline=None, save_baseline=None,
+                threshold=REGRESSION_THRESHOLD, seed=0):
+    """Drive a headless Game through each scenario; return False on a regression"""
+    header = " ".join(f"{'p' + str(p) + ' us':>9}" for p in LATENCY_PERCENTILES)
+    print(f"{'scenario':<16} {'ticks/s':>9} {header} {'peak KiB':>9}")
+    results = {}
+    for name in scenarios:
+        result = run_scenario(name, ticks, rounds, seed)
+        results[name] = result
+        latency = " ".join(f"{result['p' + str(p) + '_us']:>9.1f}" for p in LATENCY_PERCENTILES)
+        print(f"{name:<16} {result['ticks_per_s']:>9.0f} {latency} {result['peak_kib']:>9.1f}")
+
+    if save_baseline:
+        with open(save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {save_baseline}")
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), threshold)
+        if regressions:
+            print(f"Regressions beyond {threshold:.0%} of {baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return False
+        print(f"No regressions beyond {threshold:.0%} of {baseline}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Space Invaders headless benchmarks")
+    parser.add_argument("benchmark", choices=["collisions", "env", "rewind", "startup", "suite"])
+    parser.add_argument("--repeat", type=int, default=200,
+                        help="runs per measurement; the best one is reported")
+    startup = parser.add_argument_group("startup")
+    startup.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                         help="most ms to the first frame before startup counts as failed (default: %(default)s)")
+    suite = parser.add_argument_group("suite")
+    suite.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    suite.add_argument("--ticks", type=int, default=SUITE_TICKS, help="Game.update() calls per scenario")
+    suite.add_argument("--rounds", type=int, default=SUITE_ROUNDS,
+                       help="timed runs per scenario; the fastest is reported")
+    suite.add_argument("--save-baseline", metavar="FILE", help="write the results to FILE as JSON")
+    suite.add_argument("--baseline", metavar="FILE", help="compare against results saved earlier")
+    suite.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                       help="relative change that counts as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.benchmark == "collisions":
+        bench_collisions(args.repeat)
+    elif args.benchmark == "env":
+        bench_env()
+    elif args.benchmark == "rewind":
+        bench_rewind(args.repeat)
+    elif args.benchmark == "startup":
+        if not bench_startup(budget=args.budget):
+            sys.exit(1)
+    elif args.benchmark == "suite":
+        if not bench_suite(args.scenarios, args.ticks, args.rounds, args.baseline, args.save_baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1249 @@
+"""Headless Space Invaders rules.
+
+Everything in here is plain Python and NumPy: no turtle, no Tk, no
+pygame. The turtle front-end in main.py reads positions from a Simulation
+after each step and mirrors them on screen, so the same rules can be
+driven by bots, tests and benchmarks without opening a window.
+"""
+
+import struct
+import time
+
+import numpy as np
+
+from invaders_profile import PHASE_ALIENS, PHASE_COLLISIONS, PHASE_PLAYER, PHASE_PROJECTILES
+
+# Timing
+TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+REWIND_SECONDS = 5
+
+# Playfield
+WIDTH = 800
+HEIGHT = 600
+WALL_X = 380
+TOP_Y = 275
+BOTTOM_Y = -HEIGHT // 2
+
+# Input bits, one set per tick
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+
+# Player
+PLAYER_START = (0, -250)
+PLAYER_SPEED = 7  # pixels per tick while a direction is held
+PLAYER_LIVES = 3
+RESPAWN_INVULNERABILITY = 60  # 1 second at 60 ticks per second
+BLINK_INTERVAL = 6
+
+# Projectiles
+MAX_PROJECTILES = 256
+OWNER_PLAYER = 0
+OWNER_ALIEN = 1
+BULLET_SPEED = 20
+BULLET_OFFSET = 10
+FIRE_COOLDOWN = 12  # ticks between player shots
+ALIEN_SHOT_SPEED = 6
+ALIEN_FIRE_CHANCE = 0.02  # per tick, for the formation as a whole
+
+# Aliens
+ALIEN_ROWS = 5
+ALIEN_COLS = 11
+ALIEN_TOP = 200  # top row's y at the start of the first wave
+ALIEN_SPACING_X = 50  # at most; grids too big for the block below are squeezed
+ALIEN_SPACING_Y = 40
+ALIEN_MIN_SPACING = 20  # an alien sprite's width; any closer and they overlap
+FORMATION_WIDTH = 500  # widest a formation starts, centred between the walls
+FORMATION_HEIGHT = 240  # tallest, so every wave starts above the bunkers
+MAX_ALIEN_COLS = FORMATION_WIDTH // ALIEN_MIN_SPACING + 1
+MAX_ALIEN_ROWS = FORMATION_HEIGHT // ALIEN_MIN_SPACING + 1
+ALIEN_SPEED = 2
+ALIEN_DROP = 40
+INVASION_Y = -230
+ALIEN_POINTS = 10
+
+# Bunkers
+BUNKER_COUNT = 4
+BUNKER_SIZE = (44, 32)  # width, height in pixels
+BUNKER_Y = -200  # bottom edge
+BUNKER_BLAST_RADIUS = 4
+ALIEN_HALF_WIDTH = 15  # footprint an alien erases from a bunker
+ALIEN_HALF_HEIGHT = 10
+PATH_SAMPLES = 8  # points checked along each shot's last move
+
+# Waves: pattern, then march speed, fire chance and alien shot speed as
+# multiples of the Simulation's settings, then the start drop in pixels
+WAVES = (
+    ("full", 1.0, 1.0, 1.0, 0),
+    ("checker", 1.25, 1.25, 1.0, 20),
+    ("pyramid", 1.5, 1.5, 1.25, 40),
+    ("hollow", 1.5, 2.0, 1.25, 40),
+    ("full", 2.0, 2.0, 1.5, 60),
+)
+WAVE_ESCALATION = 1.1
+
+# Collision radii
+BULLET_HIT_RADIUS = 20
+PLAYER_HIT_RADIUS = 30
+SHOT_HIT_RADIUS = 15
+
+# Broad phase; cells must be at least as big as the largest radius queried.
+# Below this many shot/alien pairs testing them all outright is cheaper.
+GRID_CELL_SIZE = 40
+BROAD_PHASE_MIN_PAIRS = 4096
+
+
+def within_radius(positions, x, y, radius):
+    """Boolean mask of the rows of an (n, 2) position array closer than radius to (x, y)"""
+    dx = positions[:, 0] - x
+    dy = positions[:, 1] - y
+    return dx * dx + dy * dy < radius * radius
+
+
+class FixedTimestep:
+    """Paces a game loop at a fixed logic rate, independent of frame rate.
+
+    Each pass of the loop asks ``due()`` how many logic ticks to run. When
+    the loop falls behind, up to ``max_catch_up`` ticks are returned at once
+    and anything older is dropped, so a long stall can't snowball. When it
+    is ahead, ``wait()`` sleeps until the next tick is due.
+    """
+
+    def __init__(self, rate=TICK_RATE, max_catch_up=MAX_CATCH_UP_TICKS,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.interval = 1.0 / rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.next_tick = clock()
+
+    def due(self):
+        """Return the number of logic ticks to run now"""
+        now = self.clock()
+        if now < self.next_tick:
+            return 0
+        ticks = int((now - self.next_tick) / self.interval) + 1
+        if ticks > self.max_catch_up:
+            ticks = self.max_catch_up
+            self.next_tick = now + self.interval
+        else:
+            self.next_tick += ticks * self.interval
+        return ticks
+
+    def wait(self):
+        """Sleep until the next tick is due"""
+        delay = self.next_tick - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+
+def all_pairs_within(points, positions, items, radius):
+    """Brute-force counterpart of SpatialGrid.pairs_within(); tests every pair"""
+    delta = points[:, None, :] - positions[None, items, :]
+    point_idx, item_idx = np.nonzero((delta * delta).sum(axis=2) < radius * radius)
+    return point_idx, items[item_idx]
+
+
+class SpatialGrid:
+    """Uniform grid for broad-phase collision tests.
+
+    build() buckets a set of items by cell with a counting sort, and
+    pairs_within() only tests each query point against the items in its
+    own and the eight surrounding cells, so the cost follows the number
+    of near neighbours rather than points times items. The grid covers
+    the playfield unless told otherwise; anything outside its bounds is
+    clamped into the border cells.
+    """
+
+    NEIGHBOURS = np.array([(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+
+    def __init__(self, left=-WIDTH / 2, bottom=-HEIGHT / 2, width=WIDTH, height=HEIGHT,
+                 cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, int(-(-width // cell_size)))
+        self.rows = max(1, int(-(-height // cell_size)))
+        self.left = left
+        self.bottom = bottom
+        self.items = np.zeros(0, dtype=int)
+        self.positions = np.zeros((0, 2))
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=int)
+
+    @classmethod
+    def covering(cls, positions, cell_size=GRID_CELL_SIZE):
+        """A grid just big enough to hold every row of an (n, 2) position array"""
+        low = positions.min(axis=0)
+        high = positions.max(axis=0)
+        return cls(low[0], low[1], high[0] - low[0] + 1, high[1] - low[1] + 1, cell_size)
+
+    def cells(self, positions):
+        """Clamped (column, row) of each row of an (n, 2) position array"""
+        cx = ((positions[:, 0] - self.left) // self.cell_size).astype(int)
+        cy = ((positions[:, 1] - self.bottom) // self.cell_size).astype(int)
+        return np.clip(cx, 0, self.cols - 1), np.clip(cy, 0, self.rows - 1)
+
+    def build(self, positions, items):
+        """Bucket the given item indices by the cell their position falls in"""
+        cx, cy = self.cells(positions[items])
+        keys = cy * self.cols + cx
+        order = np.argsort(keys, kind="stable")
+        self.items = items[order]
+        self.positions = positions[self.items]
+        np.cumsum(np.bincount(keys, minlength=self.cols * self.rows), out=self.starts[1:])
+
+    def pairs_within(self, points, radius):
+        """Return (point index, item index) arrays for every pair closer than radius"""
+        cx, cy = self.cells(points)
+        ncx = cx[:, None] + self.NEIGHBOURS[:, 0]
+        ncy = cy[:, None] + self.NEIGHBOURS[:, 1]
+        valid = (ncx >= 0) & (ncx < self.cols) & (ncy >= 0) & (ncy < self.rows)
+        keys = np.where(valid, ncy * self.cols + ncx, 0)
+        first = self.starts[keys]
+        counts = np.where(valid, self.starts[keys + 1] - first, 0).ravel()
+        total = counts.sum()
+        if not total:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+        # Expand each (point, cell) range into one candidate per item
+        point_idx = np.repeat(np.repeat(np.arange(len(points)), 9), counts)
+        range_start = np.repeat(first.ravel() - (np.cumsum(counts) - counts), counts)
+        slots = np.arange(total) + range_start
+
+        delta = points[point_idx] - self.positions[slots]
+        close = (delta * delta).sum(axis=1) < radius * radius
+        return point_idx[close], self.items[slots[close]]
+
+
+def bunker_shape(width, height):
+    """Classic bunker mask: bevelled top corners and an arch cut underneath"""
+    ys, xs = np.mgrid[0:height, 0:width]
+    bevel = height // 4
+    mask = (xs + ys >= bevel) & ((width - 1 - xs) + ys >= bevel)
+    arch_w = width // 3
+    arch_h = height // 3
+    arch = ((xs - (width - 1) / 2) / (arch_w / 2)) ** 2 + ((ys - height) / arch_h) ** 2 < 1
+    return mask & ~arch
+
+
+class Bunkers:
+    """Destructible shields stored as one boolean pixel mask per bunker.
+
+    ``mask`` has shape (count, height, width) with row 0 at the top of
+    each bunker. Shots are tested by sampling their last move against the
+    masks in one vectorized lookup, and each impact carves a ragged blast
+    out of the mask with a single slice operation. Regions that changed
+    are collected in ``dirty`` so a renderer only re-uploads those.
+    """
+
+    def __init__(self, count=BUNKER_COUNT, size=BUNKER_SIZE, bottom=BUNKER_Y, rng=None):
+        self.width, self.height = size
+        self.shape = bunker_shape(self.width, self.height)
+        self.mask = np.zeros((count, self.height, self.width), dtype=bool)
+        spacing = WIDTH / (count + 1)
+        centres = -WIDTH / 2 + spacing * np.arange(1, count + 1)
+        self.left = np.round(centres - self.width / 2).astype(int)
+        self.bottom = bottom
+        self.top = bottom + self.height
+        # World coordinates of every mask column and row
+        self.col_x = self.left[:, None] + np.arange(self.width)
+        self.row_y = self.top - 1 - np.arange(self.height)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        r = BUNKER_BLAST_RADIUS
+        ys, xs = np.mgrid[-r:r + 1, -r:r + 1]
+        self.blast = xs * xs + ys * ys <= r * r
+        # Fraction of its last move each path sample lies behind a shot
+        self.lag = np.linspace(1, 0, PATH_SAMPLES)[None, :, None]
+        self.dirty = []
+        self.reset()
+
+    def reset(self):
+        self.mask[:] = self.shape
+        self.dirty = [(b, 0, 0, self.width, self.height) for b in range(len(self.mask))]
+
+    def pop_dirty(self):
+        """Return and forget the (bunker, x0, y0, x1, y1) regions changed so far"""
+        dirty, self.dirty = self.dirty, []
+        return dirty
+
+    def locate(self, points):
+        """Bunker index and mask row/column of each point, and whether it is inside that bunker's box"""
+        x = points[..., 0]
+        y = points[..., 1]
+        b = np.searchsorted(self.left, x, side="right") - 1
+        col = np.floor(x - self.left[np.maximum(b, 0)]).astype(int)
+        row = np.floor(self.top - y).astype(int)
+        inside = (b >= 0) & (col >= 0) & (col < self.width) & (row >= 0) & (row < self.height)
+        return b, row, col, inside
+
+    def lookup(self, points):
+        """Bunker index and mask row/column under each point; -1 where there is none"""
+        b, row, col, inside = self.locate(points)
+        hit = np.zeros(b.shape, dtype=bool)
+        hit[inside] = self.mask[b[inside], row[inside], col[inside]]
+        return np.where(hit, b, -1), row, col
+
+    def absorb(self, projectiles):
+        """Stop shots that ran into a bunker this tick and blast the impact"""
+        # Quick reject: only shots that crossed the bunker band this tick
+        y = projectiles.pos[:, 1]
+        prev_y = y - projectiles.vel[:, 1]
+        near = projectiles.alive & (np.maximum(y, prev_y) >= self.bottom) & (np.minimum(y, prev_y) < self.top)
+        if not near.any():
+            return 0
+        slots = np.flatnonzero(near)
+
+        # Sample each shot's path from where it was to where it is now
+        path = projectiles.pos[slots][:, None, :] - projectiles.vel[slots][:, None, :] * self.lag
+        b, row, col = self.lookup(path)
+        hit = b >= 0
+        landed = hit.any(axis=1)
+        if not landed.any():
+            return 0
+
+        first = hit[landed].argmax(axis=1)
+        which = np.flatnonzero(landed)
+        for b_i, r, c in zip(b[which, first], row[which, first], col[which, first]):
+            self.carve(int(b_i), int(r), int(c))
+        projectiles.alive[slots[landed]] = False
+        return len(which)
+
+    def trample(self, positions):
+        """Erase every bunker pixel under the aliens at ``positions``.
+
+        Aliens in a formation row share a y, so each row that overlaps the
+        bunkers is one column coverage test and one masked slice.
+        """
+        y = positions[:, 1]
+        positions = positions[(y - ALIEN_HALF_HEIGHT < self.top) & (y + ALIEN_HALF_HEIGHT > self.bottom)]
+        for row_y in np.unique(positions[:, 1]):
+            y0 = max(0, int(self.top - (row_y + ALIEN_HALF_HEIGHT)))
+            y1 = min(self.height, int(self.top - (row_y - ALIEN_HALF_HEIGHT)))
+            xs = positions[positions[:, 1] == row_y, 0]
+            cover = (np.abs(self.col_x[:, :, None] - xs) < ALIEN_HALF_WIDTH).any(axis=2)
+            band = self.mask[:, y0:y1, :]
+            eaten = (band & cover[:, None, :]).any(axis=1)
+            for b in np.flatnonzero(eaten.any(axis=1)):
+                cols = np.flatnonzero(eaten[b])
+                self.dirty.append((int(b), int(cols[0]), y0, int(cols[-1]) + 1, y1))
+            band &= ~cover[:, None, :]
+
+    def carve(self, b, row, col):
+        """Knock a ragged blast-shaped hole centred on a mask pixel"""
+        r = BUNKER_BLAST_RADIUS
+        y0, y1 = max(0, row - r), min(self.height, row + r + 1)
+        x0, x1 = max(0, col - r), min(self.width, col + r + 1)
+        blast = self.blast[y0 - row + r:y1 - row + r, x0 - col + r:x1 - col + r]
+        ragged = blast & (self.rng.random(blast.shape) < 0.8)
+        self.mask[b, y0:y1, x0:x1] &= ~ragged
+        self.mask[b, row, col] = False
+        self.dirty.append((b, x0, y0, x1, y1))
+
+
+class PlayerState:
+    def __init__(self, lives=PLAYER_LIVES):
+        self.x, self.y = PLAYER_START
+        self.speed = PLAYER_SPEED
+        self.start_lives = lives
+        self.reset()
+
+    def reset(self):
+        self.lives = self.start_lives
+        self.score = 0
+        self.x, self.y = PLAYER_START
+        self.visible = True
+        self.invulnerable = False
+        self.invulnerable_timer = 0
+        self.blink_timer = 0
+
+    def move_left(self):
+        self.x = max(-WALL_X, self.x - self.speed)
+
+    def move_right(self):
+        self.x = min(WALL_X, self.x + self.speed)
+
+    def respawn(self):
+        self.x, self.y = PLAYER_START
+        self.invulnerable = True
+        self.invulnerable_timer = RESPAWN_INVULNERABILITY
+        self.blink_timer = 0
+        self.visible = True
+
+    def update(self):
+        if self.invulnerable:
+            self.invulnerable_timer -= 1
+            self.blink_timer += 1
+
+            # Simplified blinking effect
+            if self.blink_timer % BLINK_INTERVAL == 0:
+                self.visible = not self.visible
+
+            if self.invulnerable_timer <= 0:
+                self.invulnerable = False
+                self.visible = True
+
+
+class Projectiles:
+    """Fixed-capacity pool of shots from both sides, stored as flat arrays.
+
+    Slot i is described by ``pos[i]``, ``vel[i]``, ``owner[i]`` and
+    ``alive[i]``; dead slots are reused by spawn(). Moving and culling
+    every shot is one array operation, so a few hundred live shots cost
+    about the same per tick as one.
+    """
+
+    def __init__(self, capacity=MAX_PROJECTILES):
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def clear(self):
+        self.alive[:] = False
+
+    def spawn(self, x, y, vx, vy, owner):
+        """Start a shot in a free slot; return the slot, or -1 if full"""
+        slot = int(np.argmin(self.alive))
+        if self.alive[slot]:
+            return -1
+        self.pos[slot] = (x, y)
+        self.vel[slot] = (vx, vy)
+        self.owner[slot] = owner
+        self.alive[slot] = True
+        return slot
+
+    def live(self, owner):
+        """Slots of the live shots fired by owner"""
+        return np.flatnonzero(self.alive & (self.owner == owner))
+
+    def step(self):
+        self.pos += self.vel
+        y = self.pos[:, 1]
+        self.alive &= (y <= TOP_Y) & (y >= BOTTOM_Y)
+
+
+class Formation:
+    """Grid of aliens that marches as one rigid block.
+
+    Positions live in ``pos`` (an (n, 2) array, row-major over the grid)
+    and ``alive``; ``pos`` is always ``layout`` shifted by the origin.
+    Because every alien moves with the block, the live
+    left/right/bottom extents only change when a whole edge column or the
+    bottom row is emptied, so they are tracked from per-column and per-row
+    live counts instead of being rescanned every tick.
+    """
+
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIEN_COLS, speed=ALIEN_SPEED):
+        if rows < 1 or cols < 1:
+            raise ValueError(f"a formation needs at least one row and column, not {rows}x{cols}")
+        if rows > MAX_ALIEN_ROWS or cols > MAX_ALIEN_COLS:
+            raise ValueError(f"a {rows}x{cols} formation does not fit the playfield; "
+                             f"the most is {MAX_ALIEN_ROWS}x{MAX_ALIEN_COLS}")
+        self.rows = rows
+        self.cols = cols
+        # Big grids are packed closer, but never tighter than ALIEN_MIN_SPACING,
+        # so the block still starts between the walls and above the bunkers
+        self.spacing_x = min(ALIEN_SPACING_X, FORMATION_WIDTH / max(1, cols - 1))
+        self.spacing_y = min(ALIEN_SPACING_Y, FORMATION_HEIGHT / max(1, rows - 1))
+        self.start_x = -(cols - 1) * self.spacing_x / 2
+        self.pos = np.zeros((rows * cols, 2))
+        # Offset of every slot from the (row 0, col 0) slot
+        self.layout = np.zeros((rows * cols, 2))
+        self.layout[:, 0] = np.tile(np.arange(cols), rows) * self.spacing_x
+        self.layout[:, 1] = -np.repeat(np.arange(rows), cols) * self.spacing_y
+        self.alive = np.zeros(rows * cols, dtype=bool)
+        self.col_counts = np.zeros(cols, dtype=int)
+        self.row_counts = np.zeros(rows, dtype=int)
+        self.activate(WavePattern(wave_pattern("full", rows, cols)), speed=speed)
+
+    def activate(self, pattern, origin_y=ALIEN_TOP, speed=ALIEN_SPEED):
+        """Start a new wave laid out by a prepared WavePattern.
+
+        Everything is copied into the arrays the formation already has,
+        so this allocates nothing however big the grid is.
+        """
+        # Position of the (row 0, col 0) slot; the grid is rigid
+        self.origin_x, self.origin_y = self.start_x, origin_y
+        np.add(self.layout, (self.origin_x, self.origin_y), out=self.pos)
+        np.copyto(self.alive, pattern.alive)
+        np.copyto(self.col_counts, pattern.col_counts)
+        np.copyto(self.row_counts, pattern.row_counts)
+        self.remaining = pattern.remaining
+        self.first_col = pattern.first_col
+        self.last_col = pattern.last_col
+        self.last_row = pattern.last_row
+        self.speed = speed
+        self.direction = 1
+
+    @property
+    def left(self):
+        return self.origin_x + self.first_col * self.spacing_x
+
+    @property
+    def right(self):
+        return self.origin_x + self.last_col * self.spacing_x
+
+    @property
+    def bottom(self):
+        return self.origin_y - self.last_row * self.spacing_y
+
+    def kill(self, index):
+        """Mark one alien dead and shrink the extents if it emptied an edge"""
+        self.alive[index] = False
+        self.remaining -= 1
+        row, col = divmod(int(index), self.cols)
+        self.col_counts[col] -= 1
+        self.row_counts[row] -= 1
+        if not self.remaining:
+            return
+        while self.col_counts[self.first_col] == 0:
+            self.first_col += 1
+        while self.col_counts[self.last_col] == 0:
+            self.last_col -= 1
+        while self.row_counts[self.last_row] == 0:
+            self.last_row -= 1
+
+    def shooters(self):
+        """Indices of the lowest live alien in every column that has one"""
+        grid = self.alive.reshape(self.rows, self.cols)
+        cols = np.flatnonzero(self.col_counts)
+        lowest = self.rows - 1 - np.argmax(grid[::-1, cols], axis=0)
+        return lowest * self.cols + cols
+
+    def march(self):
+        """Move one tick sideways; on hitting a wall drop and turn around.
+
+        Returns True if the formation hit a wall this tick.
+        """
+        dx = self.speed * self.direction
+        self.pos[:, 0] += dx
+        self.origin_x += dx
+        if self.right <= WALL_X and self.left >= -WALL_X:
+            return False
+        self.pos[:, 1] -= ALIEN_DROP
+        self.origin_y -= ALIEN_DROP
+        self.direction *= -1
+        return True
+
+
+def wave_pattern(name, rows, cols):
+    """(rows, cols) bool grid of the slots a named wave layout fills"""
+    r, c = np.mgrid[0:rows, 0:cols]
+    if name == "full":
+        grid = np.ones((rows, cols), dtype=bool)
+    elif name == "checker":
+        grid = (r + c) % 2 == 0
+    elif name == "pyramid":
+        # Narrow at the top, the full width on the bottom row
+        grid = np.abs(c - (cols - 1) / 2) <= (r + 1) * cols / (2 * rows)
+    elif name == "hollow":
+        grid = (r == 0) | (r == rows - 1) | (c == 0) | (c == cols - 1)
+    else:
+        raise ValueError(f"unknown wave pattern {name!r}")
+    return grid
+
+
+class WavePattern:
+    """A wave's alive mask with the Formation bookkeeping worked out ahead of time"""
+
+    def __init__(self, grid):
+        rows, cols = grid.shape
+        self.alive = grid.ravel().copy()
+        self.col_counts = grid.sum(axis=0)
+        self.row_counts = grid.sum(axis=1)
+        self.remaining = int(grid.sum())
+        filled_cols = np.flatnonzero(self.col_counts)
+        self.first_col = int(filled_cols[0])
+        self.last_col = int(filled_cols[-1])
+        self.last_row = int(np.flatnonzero(self.row_counts)[-1])
+
+
+class WaveGenerator:
+    """Streams wave settings from a table, with every layout prepared up front.
+
+    Each row of ``waves`` is (pattern, march speed, fire chance, alien
+    shot speed, start drop): the three speeds are multiples of the
+    Simulation's own settings and the drop is how far below ALIEN_TOP
+    the wave starts. Patterns are built once at construction, so wave()
+    only does arithmetic and starting a wave never builds arrays. Past
+    the end of the table it starts over, WAVE_ESCALATION times faster
+    and more trigger-happy each time round.
+    """
+
+    def __init__(self, rows, cols, waves=WAVES):
+        self.waves = waves
+        self.patterns = {name: WavePattern(wave_pattern(name, rows, cols)) for name, *_ in waves}
+
+    def wave(self, number):
+        """(pattern, speed scale, fire scale, shot speed scale, drop) of wave ``number``, from 1"""
+        lap, index = divmod(number - 1, len(self.waves))
+        name, speed, fire, shot_speed, drop = self.waves[index]
+        boost = WAVE_ESCALATION ** lap
+        return self.patterns[name], speed * boost, fire * boost, shot_speed, drop
+
+
+class Simulation:
+    """Space Invaders game rules, stepped one tick at a time.
+
+    The aliens are a Formation and the shots a Projectiles pool, both
+    NumPy arrays, so movement, wall detection and collisions are a few
+    vectorized operations per tick however big they get.
+
+    ``fire_cooldown`` is the number of ticks between player shots and
+    ``alien_fire_chance`` the chance per tick that the formation shoots
+    back. ``lives`` and ``alien_speed`` override the player's starting
+    lives and the formation's march speed in pixels per tick. Alien
+    shots come from ``rng``, a NumPy Generator seeded with ``seed``.
+
+    Each wave's layout and how much faster and fiercer it is than these
+    settings come from a WaveGenerator over WAVES.
+
+    Side effects the front-end cares about (sounds, HUD refreshes) are
+    reported as strings in ``events``, which is cleared at the start of
+    every step. Set ``profiler`` to a FrameProfiler to have each phase of
+    step() timed.
+    """
+
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIEN_COLS, fire_cooldown=FIRE_COOLDOWN,
+                 alien_fire_chance=ALIEN_FIRE_CHANCE, lives=PLAYER_LIVES,
+                 alien_speed=ALIEN_SPEED, seed=None):
+        self.player = PlayerState(lives)
+        self.projectiles = Projectiles()
+        self.formation = Formation(rows, cols, alien_speed)
+        self.waves = WaveGenerator(rows, cols)
+        self.grid = None
+        self.fire_cooldown = fire_cooldown
+        self.alien_fire_chance = alien_fire_chance
+        self.alien_speed = alien_speed
+        # The current wave's versions of the settings above
+        self.alien_fire_rate = alien_fire_chance
+        self.alien_shot_speed = ALIEN_SHOT_SPEED
+        self.rng = np.random.default_rng(seed)
+        self.bunkers = Bunkers(rng=self.rng)
+        self.fire_timer = 0
+        self.game_over = False
+        self.wave = 0
+        self.events = []
+        self.profiler = None
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start a new game; with ``seed``, alien fire and bunker damage start over from it too"""
+        if seed is not None:
+            self.rng = self.bunkers.rng = np.random.default_rng(seed)
+        self.player.reset()
+        self.projectiles.clear()
+        self.bunkers.reset()
+        self.fire_timer = 0
+        self.game_over = False
+        self.wave = 0
+        self.events = []
+        self.setup_aliens()
+
+    def setup_aliens(self):
+        self.wave += 1
+        pattern, speed, fire, shot_speed, drop = self.waves.wave(self.wave)
+        self.formation.activate(pattern, ALIEN_TOP - drop, self.alien_speed * speed)
+        self.alien_fire_rate = self.alien_fire_chance * fire
+        self.alien_shot_speed = ALIEN_SHOT_SPEED * shot_speed
+
+    def fire_bullet(self):
+        """Fire if the cooldown allows it; return True if a shot was fired"""
+        if self.game_over or self.fire_timer > 0:
+            return False
+        slot = self.projectiles.spawn(self.player.x, self.player.y + BULLET_OFFSET,
+                                      0, BULLET_SPEED, OWNER_PLAYER)
+        if slot < 0:
+            return False
+        self.fire_timer = self.fire_cooldown
+        self.events.append('shoot')
+        return True
+
+    def alien_fire(self):
+        """Maybe have one of the front-line aliens shoot at the player"""
+        if not self.formation.remaining or self.rng.random() >= self.alien_fire_rate:
+            return
+        shooter = self.rng.choice(self.formation.shooters())
+        x, y = self.formation.pos[shooter]
+        if self.projectiles.spawn(x, y - BULLET_OFFSET, 0, -self.alien_shot_speed, OWNER_ALIEN) >= 0:
+            self.events.append('alien_shoot')
+
+    def handle_collision(self):
+        """Take a life from the player; return True if one was taken"""
+        if self.game_over or self.player.invulnerable:
+            return False
+
+        self.player.lives -= 1
+        self.events.append('explosion')
+        self.events.append('lives')
+
+        if self.player.lives <= 0:
+            self.game_over = True
+            self.events.append('gameover')
+        else:
+            # Just respawn player, keep aliens in current position
+            self.player.respawn()
+            self.projectiles.clear()
+        return True
+
+    def hit_aliens(self):
+        """Resolve player shots against the formation; return aliens killed"""
+        projectiles = self.projectiles
+        formation = self.formation
+        shots = projectiles.live(OWNER_PLAYER)
+        if not shots.size:
+            return 0
+
+        points = projectiles.pos[shots]
+        if len(points) * formation.remaining <= BROAD_PHASE_MIN_PAIRS:
+            targets = np.flatnonzero(formation.alive)
+            shot_idx, alien_idx = all_pairs_within(points, formation.pos, targets, BULLET_HIT_RADIUS)
+        else:
+            # The formation is rigid and every wave shares its layout, so the
+            # grid is built once in formation space; shots are moved into
+            # that space instead, and dead aliens are filtered out after the lookup
+            if self.grid is None:
+                self.grid = SpatialGrid.covering(formation.layout, BULLET_HIT_RADIUS)
+                self.grid.build(formation.layout, np.arange(len(formation.layout)))
+            local = points - (formation.origin_x, formation.origin_y)
+            shot_idx, alien_idx = self.grid.pairs_within(local, BULLET_HIT_RADIUS)
+            live = formation.alive[alien_idx]
+            shot_idx, alien_idx = shot_idx[live], alien_idx[live]
+        if not shot_idx.size:
+            return 0
+
+        # A shot only ever takes the first alien it touches
+        order = np.lexsort((alien_idx, shot_idx))
+        landed, first = np.unique(shot_idx[order], return_index=True)
+        victims = np.unique(alien_idx[order][first])
+        projectiles.alive[shots[landed]] = False
+        for victim in victims:
+            formation.kill(victim)
+        return len(victims)
+
+    def step(self, inputs=0):
+        """Advance the game by one tick.
+
+        ``inputs`` is a bitmask of INPUT_LEFT, INPUT_RIGHT and INPUT_FIRE
+        for the controls held during this tick.
+        """
+        self.events = []
+        if self.game_over:
+            return
+        profiler = self.profiler
+
+        if self.fire_timer > 0:
+            self.fire_timer -= 1
+        if inputs & INPUT_LEFT:
+            self.player.move_left()
+        if inputs & INPUT_RIGHT:
+            self.player.move_right()
+        if inputs & INPUT_FIRE:
+            self.fire_bullet()
+
+        self.player.update()
+        if profiler is not None:
+            profiler.mark(PHASE_PLAYER)
+
+        self.projectiles.step()
+        self.bunkers.absorb(self.projectiles)
+        self.alien_fire()
+        if profiler is not None:
+            profiler.mark(PHASE_PROJECTILES)
+
+        formation = self.formation
+
+        # Reaching the bottom costs a life, but the tick carries on
+        if formation.march() and formation.bottom < INVASION_Y:
+            self.handle_collision()
+
+        # Aliens low enough to reach the bunkers chew through them
+        if formation.bottom - ALIEN_HALF_HEIGHT < self.bunkers.top:
+            self.bunkers.trample(formation.pos[formation.alive])
+        if profiler is not None:
+            profiler.mark(PHASE_ALIENS)
+
+        # Check collision with player
+        if np.any(formation.alive & within_radius(formation.pos, self.player.x, self.player.y, PLAYER_HIT_RADIUS)):
+            self.handle_collision()
+
+        # Alien shots against the player
+        shots = self.projectiles.live(OWNER_ALIEN)
+        if shots.size:
+            hits = shots[within_radius(self.projectiles.pos[shots], self.player.x, self.player.y, SHOT_HIT_RADIUS)]
+            if hits.size and self.handle_collision():
+                self.projectiles.alive[hits] = False
+
+        # Player shots against the aliens
+        killed = self.hit_aliens()
+        if killed:
+            self.player.score += killed * ALIEN_POINTS
+            self.events.append('explosion')
+            self.events.append('score')
+            if not formation.remaining:
+                self.setup_aliens()
+                self.events.append('wave')
+        if profiler is not None:
+            profiler.mark(PHASE_COLLISIONS)
+
+
+class BatchSimulation:
+    """Many independent games under Simulation's rules, stepped together.
+
+    Every game's state is a row of an (n, ...) array: the player's
+    ``player_x``, ``lives`` and ``score``, the formation's ``origin``,
+    ``alive`` and extents, the shot pool's ``shot_pos``/``shot_vel``/
+    ``shot_owner``/``shot_alive`` and the ``bunkers`` masks. step() runs
+    each phase of Simulation.step() as one array operation over all the
+    games, so the Python overhead of a tick is paid once for the batch
+    rather than once per game. Only starting a wave and resetting a game
+    loop in Python, over the games they apply to.
+
+    All games share the grid size, settings and one ``rng``, so alien
+    fire and bunker damage differ from a Simulation with the same seed;
+    everything else plays out exactly as in a Simulation fed the same
+    inputs. There are no ``events``: nothing renders a batch.
+    """
+
+    def __init__(self, num_games, rows=ALIEN_ROWS, cols=ALIEN_COLS, fire_cooldown=FIRE_COOLDOWN,
+                 alien_fire_chance=ALIEN_FIRE_CHANCE, lives=PLAYER_LIVES,
+                 alien_speed=ALIEN_SPEED, seed=None):
+        n = num_games
+        self.num_games = n
+        self.fire_cooldown = fire_cooldown
+        self.alien_fire_chance = alien_fire_chance
+        self.alien_speed = alien_speed
+        self.start_lives = lives
+        self.rng = np.random.default_rng(seed)
+
+        # Shared by every game: the grid layout, wave table and bunker geometry
+        formation = Formation(rows, cols)
+        self.rows = rows
+        self.cols = cols
+        self.layout = formation.layout
+        self.spacing_x = formation.spacing_x
+        self.spacing_y = formation.spacing_y
+        self.start_x = formation.start_x
+        self.waves = WaveGenerator(rows, cols)
+        self.grid = SpatialGrid.covering(self.layout, BULLET_HIT_RADIUS)
+        self.grid.build(self.layout, np.arange(len(self.layout)))
+        self.geometry = Bunkers(rng=self.rng)
+
+        self.player_x = np.zeros(n)
+        self.lives = np.zeros(n, dtype=int)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.visible = np.zeros(n, dtype=bool)
+        self.invulnerable = np.zeros(n, dtype=bool)
+        self.invulnerable_timer = np.zeros(n, dtype=int)
+        self.blink_timer = np.zeros(n, dtype=int)
+        self.fire_timer = np.zeros(n, dtype=int)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.wave = np.zeros(n, dtype=int)
+        self.alien_fire_rate = np.zeros(n)
+        self.alien_shot_speed = np.zeros(n)
+
+        self.origin = np.zeros((n, 2))
+        self.alive = np.zeros((n, rows * cols), dtype=bool)
+        self.col_counts = np.zeros((n, cols), dtype=int)
+        self.row_counts = np.zeros((n, rows), dtype=int)
+        self.remaining = np.zeros(n, dtype=int)
+        self.first_col = np.zeros(n, dtype=int)
+        self.last_col = np.zeros(n, dtype=int)
+        self.last_row = np.zeros(n, dtype=int)
+        self.speed = np.zeros(n)
+        self.direction = np.zeros(n, dtype=int)
+
+        self.shot_pos = np.zeros((n, MAX_PROJECTILES, 2))
+        self.shot_vel = np.zeros((n, MAX_PROJECTILES, 2))
+        self.shot_owner = np.zeros((n, MAX_PROJECTILES), dtype=np.int8)
+        self.shot_alive = np.zeros((n, MAX_PROJECTILES), dtype=bool)
+
+        # The masks sit inside a blast-radius border, so a blast at a
+        # bunker's edge is one fixed-size write; ``bunkers`` is the inside
+        r = BUNKER_BLAST_RADIUS
+        count, height, width = self.geometry.mask.shape
+        self.bunker_pixels = np.zeros((n, count, height + 2 * r, width + 2 * r), dtype=bool)
+        self.bunkers = self.bunker_pixels[:, :, r:r + height, r:r + width]
+        self.reset()
+
+    def reset(self, games=None):
+        """Start new games: all of them, or those at the given indices"""
+        games = np.arange(self.num_games) if games is None else np.asarray(games)
+        self.player_x[games] = PLAYER_START[0]
+        self.lives[games] = self.start_lives
+        self.score[games] = 0
+        self.visible[games] = True
+        self.invulnerable[games] = False
+        self.invulnerable_timer[games] = 0
+        self.blink_timer[games] = 0
+        self.fire_timer[games] = 0
+        self.game_over[games] = False
+        self.shot_alive[games] = False
+        self.bunkers[games] = self.geometry.shape
+        self.wave[games] = 0
+        self.setup_aliens(games)
+
+    def setup_aliens(self, games):
+        """Start the next wave in each of the given games"""
+        self.wave[games] += 1
+        # Games on the same wave start from the same pattern, so this loops
+        # over wave numbers rather than games
+        for number in np.unique(self.wave[games]):
+            g = games[self.wave[games] == number]
+            pattern, speed, fire, shot_speed, drop = self.waves.wave(int(number))
+            self.origin[g] = (self.start_x, ALIEN_TOP - drop)
+            self.alive[g] = pattern.alive
+            self.col_counts[g] = pattern.col_counts
+            self.row_counts[g] = pattern.row_counts
+            self.remaining[g] = pattern.remaining
+            self.first_col[g] = pattern.first_col
+            self.last_col[g] = pattern.last_col
+            self.last_row[g] = pattern.last_row
+            self.speed[g] = self.alien_speed * speed
+            self.direction[g] = 1
+            self.alien_fire_rate[g] = self.alien_fire_chance * fire
+            self.alien_shot_speed[g] = ALIEN_SHOT_SPEED * shot_speed
+
+    @property
+    def bottom(self):
+        return self.origin[:, 1] - self.last_row * self.spacing_y
+
+    def spawn(self, games, x, y, vx, vy, owner):
+        """Start a shot in each game's first free slot; return the games that had one"""
+        slot = np.argmin(self.shot_alive[games], axis=1)
+        free = ~self.shot_alive[games, slot]
+        shot = np.empty((len(games), 2, 2))
+        shot[:, 0, 0], shot[:, 0, 1], shot[:, 1, 0], shot[:, 1, 1] = x, y, vx, vy
+        games, slot, shot = games[free], slot[free], shot[free]
+        self.shot_pos[games, slot] = shot[:, 0]
+        self.shot_vel[games, slot] = shot[:, 1]
+        self.shot_owner[games, slot] = owner
+        self.shot_alive[games, slot] = True
+        return games
+
+    def handle_collision(self, games):
+        """Take a life from each of the given games' players that can lose one; return those games"""
+        games = games[~self.game_over[games] & ~self.invulnerable[games]]
+        self.lives[games] -= 1
+        over = self.lives[games] <= 0
+        self.game_over[games[over]] = True
+        respawned = games[~over]
+        self.player_x[respawned] = PLAYER_START[0]
+        self.invulnerable[respawned] = True
+        self.invulnerable_timer[respawned] = RESPAWN_INVULNERABILITY
+        self.blink_timer[respawned] = 0
+        self.visible[respawned] = True
+        self.shot_alive[respawned] = False
+        return games
+
+    def absorb(self, active):
+        """Stop shots that ran into a bunker this tick and blast the impacts"""
+        geometry = self.geometry
+        y = self.shot_pos[:, :, 1]
+        prev_y = y - self.shot_vel[:, :, 1]
+        near = (self.shot_alive & active[:, None] & (np.maximum(y, prev_y) >= geometry.bottom)
+                & (np.minimum(y, prev_y) < geometry.top))
+        games, slots = np.nonzero(near)
+        if not games.size:
+            return
+
+        path = self.shot_pos[games, slots][:, None, :] - self.shot_vel[games, slots][:, None, :] * geometry.lag
+        b, row, col, inside = geometry.locate(path)
+        path_games = np.broadcast_to(games[:, None], b.shape)
+        hit = np.zeros(b.shape, dtype=bool)
+        hit[inside] = self.bunkers[path_games[inside], b[inside], row[inside], col[inside]]
+        landed = hit.any(axis=1)
+        if not landed.any():
+            return
+
+        which = np.flatnonzero(landed)
+        first = hit[which].argmax(axis=1)
+        self.carve(games[which], b[which, first], row[which, first], col[which, first])
+        self.shot_alive[games[which], slots[which]] = False
+
+    def carve(self, games, b, row, col):
+        """Knock a ragged blast-shaped hole into each game's bunker at the given pixels"""
+        blast = self.geometry.blast
+        ragged = blast & (self.rng.random((len(games),) + blast.shape) < 0.8)
+        i, dy, dx = np.nonzero(ragged)
+        # Border pixel (row + dy, col + dx) is mask pixel (row + dy - r, col + dx - r)
+        self.bunker_pixels[games[i], b[i], row[i] + dy, col[i] + dx] = False
+        self.bunkers[games, b, row, col] = False
+
+    def trample(self, games):
+        """Erase every bunker pixel under the given games' live aliens"""
+        geometry = self.geometry
+        # The (game, formation row) pairs with live aliens overlapping the bunkers
+        rows_y = self.origin[games, 1][:, None] - np.arange(self.rows) * self.spacing_y
+        alive = self.alive[games].reshape(len(games), self.rows, self.cols)
+        band = (alive.any(axis=2) & (rows_y - ALIEN_HALF_HEIGHT < geometry.top)
+                & (rows_y + ALIEN_HALF_HEIGHT > geometry.bottom))
+        game, row = np.nonzero(band)
+        if not game.size:
+            return
+
+        # Mask columns under a live alien of each row. Aliens are further apart
+        # than half an alien is wide, so only the two either side can cover one.
+        # Clamping to one slot past either end, which stays empty, keeps the
+        # lookups in bounds without changing the answer.
+        col_x = geometry.col_x.ravel()
+        origin_x = self.origin[games[game], 0][:, None]
+        row_alive = np.zeros((len(game), self.cols + 3), dtype=bool)
+        row_alive[:, 1:self.cols + 1] = alive[game, row]
+        row_start = np.arange(len(game))[:, None] * row_alive.shape[1] + 1
+        near = np.clip(np.floor((col_x - origin_x) / self.spacing_x), -1, self.cols).astype(int)
+        covered_cols = np.zeros((len(game), len(col_x)), dtype=bool)
+        for col in (near, near + 1):
+            covered_cols |= (row_alive.ravel()[row_start + col]
+                             & (np.abs(col_x - (origin_x + col * self.spacing_x)) < ALIEN_HALF_WIDTH))
+
+        # Mask rows each formation row covers, as in Bunkers.trample(). Rows
+        # are further apart than an alien is tall, so no two cover the same
+        # mask row and each (game, mask row) below is written once
+        row_y = rows_y[game, row][:, None]
+        y0 = np.trunc(geometry.top - (row_y + ALIEN_HALF_HEIGHT))
+        y1 = np.trunc(geometry.top - (row_y - ALIEN_HALF_HEIGHT))
+        pixel_rows = np.arange(geometry.height)
+        pair, pixel_row = np.nonzero((pixel_rows >= y0) & (pixel_rows < y1))
+        eaten = covered_cols[pair].reshape(len(pair), -1, geometry.width)
+        self.bunkers[games[game[pair]], :, pixel_row, :] &= ~eaten
+
+    def alien_fire(self, active):
+        """Maybe have a front-line alien in each game shoot at its player"""
+        draw = self.rng.random((2, self.num_games))
+        games = np.flatnonzero(active & (self.remaining > 0) & (draw[0] < self.alien_fire_rate))
+        if not games.size:
+            return
+
+        # Pick a uniformly random non-empty column, then its lowest live alien
+        filled = self.col_counts[games] > 0
+        pick = (draw[1, games] * filled.sum(axis=1)).astype(int)
+        col = np.argmax(np.cumsum(filled, axis=1) > pick[:, None], axis=1)
+        grid = self.alive[games].reshape(len(games), self.rows, self.cols)
+        column = grid[np.arange(len(games)), :, col]
+        lowest = self.rows - 1 - np.argmax(column[:, ::-1], axis=1)
+        x = self.origin[games, 0] + col * self.spacing_x
+        y = self.origin[games, 1] - lowest * self.spacing_y
+        self.spawn(games, x, y - BULLET_OFFSET, 0, -self.alien_shot_speed[games], OWNER_ALIEN)
+
+    def march(self, active):
+        """Move every formation one tick sideways; return the games that hit a wall"""
+        self.origin[:, 0] += self.speed * self.direction * active
+        left = self.origin[:, 0] + self.first_col * self.spacing_x
+        right = self.origin[:, 0] + self.last_col * self.spacing_x
+        turned = active & ((right > WALL_X) | (left < -WALL_X))
+        self.origin[turned, 1] -= ALIEN_DROP
+        self.direction[turned] *= -1
+        return turned
+
+    def kill(self, games, victims):
+        """Mark aliens dead, one (game, alien index) pair each, and shrink the extents"""
+        self.alive[games, victims] = False
+        row, col = np.divmod(victims, self.cols)
+        np.subtract.at(self.col_counts, (games, col), 1)
+        np.subtract.at(self.row_counts, (games, row), 1)
+        np.subtract.at(self.remaining, games, 1)
+
+        touched = np.unique(games)
+        filled_cols = self.col_counts[touched] > 0
+        self.first_col[touched] = np.argmax(filled_cols, axis=1)
+        self.last_col[touched] = self.cols - 1 - np.argmax(filled_cols[:, ::-1], axis=1)
+        filled_rows = self.row_counts[touched] > 0
+        self.last_row[touched] = self.rows - 1 - np.argmax(filled_rows[:, ::-1], axis=1)
+
+    def hit_aliens(self, active):
+        """Resolve player shots against the formations; return aliens killed per game"""
+        games, slots = np.nonzero(self.shot_alive & (self.shot_owner == OWNER_PLAYER) & active[:, None])
+        if not games.size:
+            return None
+
+        # Every game shares the layout, so all shots go into formation space
+        # and are tested against the one grid together
+        local = self.shot_pos[games, slots] - self.origin[games]
+        if len(local) * len(self.layout) <= BROAD_PHASE_MIN_PAIRS:
+            shot_idx, alien_idx = all_pairs_within(local, self.layout, np.arange(len(self.layout)),
+                                                   BULLET_HIT_RADIUS)
+        else:
+            shot_idx, alien_idx = self.grid.pairs_within(local, BULLET_HIT_RADIUS)
+        live = self.alive[games[shot_idx], alien_idx]
+        shot_idx, alien_idx = shot_idx[live], alien_idx[live]
+        if not shot_idx.size:
+            return None
+
+        # A shot only ever takes the first alien it touches
+        order = np.lexsort((alien_idx, shot_idx))
+        landed, first = np.unique(shot_idx[order], return_index=True)
+        self.shot_alive[games[landed], slots[landed]] = False
+        victims = np.unique(games[landed] * len(self.layout) + alien_idx[order][first])
+        victim_games, victims = np.divmod(victims, len(self.layout))
+        self.kill(victim_games, victims)
+        return np.bincount(victim_games, minlength=self.num_games)
+
+    def step(self, inputs):
+        """Advance every game by one tick; ``inputs`` holds one Simulation.step() bitmask per game"""
+        active = ~self.game_over
+        inputs = np.where(active, inputs, 0)
+
+        np.subtract(self.fire_timer, 1, out=self.fire_timer, where=active & (self.fire_timer > 0))
+        left = (inputs & INPUT_LEFT) != 0
+        np.copyto(self.player_x, np.maximum(-WALL_X, self.player_x - PLAYER_SPEED), where=left)
+        right = (inputs & INPUT_RIGHT) != 0
+        np.copyto(self.player_x, np.minimum(WALL_X, self.player_x + PLAYER_SPEED), where=right)
+        firing = np.flatnonzero(((inputs & INPUT_FIRE) != 0) & (self.fire_timer <= 0))
+        if firing.size:
+            fired = self.spawn(firing, self.player_x[firing], PLAYER_START[1] + BULLET_OFFSET,
+                               0, BULLET_SPEED, OWNER_PLAYER)
+            self.fire_timer[fired] = self.fire_cooldown
+
+        blinking = active & self.invulnerable
+        self.invulnerable_timer[blinking] -= 1
+        self.blink_timer[blinking] += 1
+        self.visible ^= blinking & (self.blink_timer % BLINK_INTERVAL == 0)
+        recovered = blinking & (self.invulnerable_timer <= 0)
+        self.invulnerable[recovered] = False
+        self.visible[recovered] = True
+
+        # Shots in finished games stay where they are, as in Simulation
+        np.add(self.shot_pos, self.shot_vel, out=self.shot_pos, where=active[:, None, None])
+        y = self.shot_pos[:, :, 1]
+        self.shot_alive &= (y <= TOP_Y) & (y >= BOTTOM_Y)
+        self.absorb(active)
+        self.alien_fire(active)
+
+        # Reaching the bottom costs a life, but the tick carries on
+        turned = self.march(active)
+        self.handle_collision(np.flatnonzero(turned & (self.bottom < INVASION_Y)))
+
+        # Aliens low enough to reach the bunkers chew through them
+        low = np.flatnonzero(active & (self.bottom - ALIEN_HALF_HEIGHT < self.geometry.top))
+        if low.size:
+            self.trample(low)
+
+        # Aliens against the player; only formations that reach down to it can touch it
+        games = np.flatnonzero(active & (self.bottom < PLAYER_START[1] + PLAYER_HIT_RADIUS))
+        if games.size:
+            player = np.column_stack((self.player_x[games], np.full(len(games), PLAYER_START[1])))
+            delta = self.layout - (player - self.origin[games])[:, None, :]
+            touching = self.alive[games] & ((delta * delta).sum(axis=2) < PLAYER_HIT_RADIUS * PLAYER_HIT_RADIUS)
+            self.handle_collision(games[touching.any(axis=1)])
+
+        # Alien shots against the player
+        dx = self.shot_pos[:, :, 0] - self.player_x[:, None]
+        dy = self.shot_pos[:, :, 1] - PLAYER_START[1]
+        hits = (self.shot_alive & (self.shot_owner == OWNER_ALIEN) & active[:, None]
+                & (dx * dx + dy * dy < SHOT_HIT_RADIUS * SHOT_HIT_RADIUS))
+        struck = self.handle_collision(np.flatnonzero(hits.any(axis=1)))
+        self.shot_alive[struck] &= ~hits[struck]
+
+        # Player shots against the aliens
+        killed = self.hit_aliens(active)
+        if killed is not None:
+            self.score += killed * ALIEN_POINTS
+            cleared = np.flatnonzero((killed > 0) & (self.remaining == 0))
+            if cleared.size:
+                self.setup_aliens(cleared)
+
+
+class Rewind:
+    """Ring buffer of per-tick Simulation snapshots for scrubbing backwards.
+
+    Storage for ``seconds`` worth of ticks is allocated up front: one
+    NumPy slab per state array with a row per snapshot, plus a bytearray
+    of struct-packed scalars. snapshot() copies the state into the next
+    row and rewind() copies an older row back, so neither allocates per
+    tick and memory stays at ``nbytes`` however long the game runs.
+
+    The RNG is not part of a snapshot: play resumed after a rewind sees
+    different alien shots than the first time round.
+    """
+    # player x, y, lives, score, visible, invulnerable, invulnerable_timer, blink_timer;
+    # fire_timer, game_over, wave, alien_fire_rate, alien_shot_speed; formation origin_x,
+    # origin_y, speed, direction, remaining, first_col, last_col, last_row
+    SCALARS = struct.Struct("<ddiq??iii?idddddiiiii")
+
+    def __init__(self, sim, seconds=REWIND_SECONDS, rate=TICK_RATE):
+        self.sim = sim
+        self.capacity = max(2, int(seconds * rate))
+        n = self.capacity
+        formation = sim.formation
+        projectiles = sim.projectiles
+        self.scalars = bytearray(n * self.SCALARS.size)
+        self.alive = np.zeros((n,) + formation.alive.shape, dtype=bool)
+        self.col_counts = np.zeros((n,) + formation.col_counts.shape, dtype=formation.col_counts.dtype)
+        self.row_counts = np.zeros((n,) + formation.row_counts.shape, dtype=formation.row_counts.dtype)
+        self.shot_pos = np.zeros((n,) + projectiles.pos.shape)
+        self.shot_vel = np.zeros((n,) + projectiles.vel.shape)
+        self.shot_owner = np.zeros((n,) + projectiles.owner.shape, dtype=projectiles.owner.dtype)
+        self.shot_alive = np.zeros((n,) + projectiles.alive.shape, dtype=bool)
+        self.bunkers = np.zeros((n,) + sim.bunkers.mask.shape, dtype=bool)
+        self.head = 0  # row the next snapshot goes in
+        self.count = 0
+
+    @property
+    def nbytes(self):
+        arrays = (self.alive, self.col_counts, self.row_counts, self.shot_pos,
+                  self.shot_vel, self.shot_owner, self.shot_alive, self.bunkers)
+        return len(self.scalars) + sum(a.nbytes for a in arrays)
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def snapshot(self):
+        """Store the current state as the newest snapshot, dropping the oldest if full"""
+        i = self.head
+        sim = self.sim
+        player = sim.player
+        formation = sim.formation
+        projectiles = sim.projectiles
+        self.SCALARS.pack_into(
+            self.scalars, i * self.SCALARS.size,
+            player.x, player.y, player.lives, player.score, player.visible, player.invulnerable,
+            player.invulnerable_timer, player.blink_timer, sim.fire_timer, sim.game_over, sim.wave,
+            sim.alien_fire_rate, sim.alien_shot_speed, formation.origin_x, formation.origin_y,
+            formation.speed, formation.direction, formation.remaining, formation.first_col,
+            formation.last_col, formation.last_row)
+        self.alive[i] = formation.alive
+        self.col_counts[i] = formation.col_counts
+        self.row_counts[i] = formation.row_counts
+        self.shot_pos[i] = projectiles.pos
+        self.shot_vel[i] = projectiles.vel
+        self.shot_owner[i] = projectiles.owner
+        self.shot_alive[i] = projectiles.alive
+        self.bunkers[i] = sim.bunkers.mask
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rewind(self):
+        """Step back one tick; return False once there is nothing older left"""
+        if self.count < 2:
+            return False
+        # The newest snapshot is the current state, so drop it and restore the one before
+        self.head = (self.head - 1) % self.capacity
+        self.count -= 1
+        self.restore((self.head - 1) % self.capacity)
+        return True
+
+    def restore(self, i):
+        sim = self.sim
+        player = sim.player
+        formation = sim.formation
+        projectiles = sim.projectiles
+        (player.x, player.y, player.lives, player.score, player.visible, player.invulnerable,
+         player.invulnerable_timer, player.blink_timer, sim.fire_timer, sim.game_over, sim.wave,
+         sim.alien_fire_rate, sim.alien_shot_speed, formation.origin_x, formation.origin_y,
+         formation.speed, formation.direction, formation.remaining, formation.first_col,
+         formation.last_col, formation.last_row) = self.SCALARS.unpack_from(self.scalars, i * self.SCALARS.size)
+        formation.alive[:] = self.alive[i]
+        formation.col_counts[:] = self.col_counts[i]
+        formation.row_counts[:] = self.row_counts[i]
+        np.add(formation.layout, (formation.origin_x, formation.origin_y), out=formation.pos)
+        projectiles.pos[:] = self.shot_pos[i]
+        projectiles.vel[:] = self.shot_vel[i]
+        projectiles.owner[:] = self.shot_owner[i]
+        projectiles.alive[:] = self.shot_alive[i]
+
+        bunkers = sim.bunkers
+        if not np.array_equal(bunkers.mask, self.bunkers[i]):
+            bunkers.mask[:] = self.bunkers[i]
+            bunkers.dirty.extend((b, 0, 0, bunkers.width, bunkers.height) for b in range(len(bunkers.mask)))
+        sim.events = []
@@ -0,0 +1,100 @@
+"""Gym-style vector environment over the headless Space Invaders core.
+
+VecEnv plays N independent games as one BatchSimulation. reset() and
+step(actions) take and return arrays with one row per game, in the
+reset/step shape RL libraries expect, without needing a window or a
+gym install:
+
+    env = VecEnv(64, seed=0)
+    obs = env.reset()
+    obs, rewards, dones, infos = env.step(env.sample_actions())
+
+Actions are input bitmasks (INPUT_LEFT | INPUT_RIGHT | INPUT_FIRE), so
+there are ACTIONS = 8 of them. A game that ends is reset straight away
+and its final score is reported in that step's infos.
+"""
+
+import numpy as np
+
+from invaders_core import (BatchSimulation, ALIEN_ROWS, ALIEN_COLS, MAX_PROJECTILES,
+                           INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE)
+
+ACTIONS = (INPUT_LEFT | INPUT_RIGHT | INPUT_FIRE) + 1
+
+
+class VecEnv:
+    """N Space Invaders games behind one reset()/step() pair.
+
+    Every game's state already lives in the BatchSimulation's (n, ...)
+    arrays and step() advances them all with one batched tick, so a step
+    costs far less than N single-game ticks. The alien and shot
+    observations are views of those arrays rather than copies; they are
+    live, so copy them if you keep them past the next call:
+
+    ``aliens``       (n, rows, cols) bool, which formation slots are alive
+    ``formation``    (n, 3) float, formation origin x, y and march direction
+    ``player``       (n, 2) float, player x and lives left
+    ``shots``        (n, capacity, 2) float, shot positions per slot
+    ``shot_owner``   (n, capacity) int8, OWNER_PLAYER or OWNER_ALIEN
+    ``shots_alive``  (n, capacity) bool, which shot slots are in use
+
+    Rewards are the score gained during the step and ``dones`` flags
+    games that ended on it.
+    """
+
+    def __init__(self, num_envs, rows=ALIEN_ROWS, cols=ALIEN_COLS, seed=None, **sim_options):
+        self.num_envs = num_envs
+        action_seed, sim_seed = np.random.SeedSequence(seed).spawn(2)
+        self.rng = np.random.default_rng(action_seed)
+        self.sim = BatchSimulation(num_envs, rows, cols, seed=sim_seed, **sim_options)
+
+        sim = self.sim
+        self.obs = {
+            "aliens": sim.alive.reshape(num_envs, rows, cols),
+            "formation": np.zeros((num_envs, 3)),
+            "player": np.zeros((num_envs, 2)),
+            "shots": sim.shot_pos,
+            "shot_owner": sim.shot_owner,
+            "shots_alive": sim.shot_alive,
+        }
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.rewards = np.zeros(num_envs, dtype=np.int64)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self):
+        self.sim.reset()
+        self.scores[:] = 0
+        self.episode_steps[:] = 0
+        self.observe()
+        return self.obs
+
+    def sample_actions(self):
+        """Uniformly random actions, one per game"""
+        return self.rng.integers(ACTIONS, size=self.num_envs)
+
+    def step(self, actions):
+        """Advance every game one tick with its action; return (obs, rewards, dones, infos)"""
+        sim = self.sim
+        sim.step(np.asarray(actions))
+        self.episode_steps += 1
+        np.subtract(sim.score, self.scores, out=self.rewards)
+        np.copyto(self.dones, sim.game_over)
+        infos = []
+        ended = np.flatnonzero(sim.game_over)
+        if ended.size:
+            infos = [{"env": int(i), "score": int(sim.score[i]), "waves": int(sim.wave[i]) - 1,
+                      "steps": int(self.episode_steps[i])} for i in ended]
+            sim.reset(ended)
+            self.episode_steps[ended] = 0
+        np.copyto(self.scores, sim.score)
+        self.observe()
+        return self.obs, self.rewards, self.dones, infos
+
+    def observe(self):
+        """Fill in the per-game scalars that aren't views of the simulation's arrays"""
+        sim = self.sim
+        self.obs["formation"][:, :2] = sim.origin
+        self.obs["formation"][:, 2] = sim.direction
+        self.obs["player"][:, 0] = sim.player_x
+        self.obs["player"][:, 1] = sim.lives
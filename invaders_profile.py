@@ -0,0 +1,100 @@
+"""Per-phase frame timings for Space Invaders.
+
+A frame is split into the phases below. The Simulation marks the ones
+inside a logic tick and the front-end marks the rest, so
+
+    python main.py --profile frames.json --profile-overlay
+
+shows where each frame's time goes and saves the timings on exit.
+"""
+
+import csv
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Frame phases timed by FrameProfiler
+PHASE_INPUT = 0
+PHASE_PLAYER = 1
+PHASE_PROJECTILES = 2  # moving shots, bunker hits and alien fire
+PHASE_ALIENS = 3
+PHASE_COLLISIONS = 4
+PHASE_EVENTS = 5  # sounds and HUD updates in the front-end
+PHASE_RENDER = 6
+PHASE_PRESENT = 7
+PHASE_NAMES = ("input", "player", "projectiles", "aliens", "collisions", "events", "render", "present")
+PROFILE_FRAMES = 600
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a preallocated ring buffer.
+
+    A frame is bracketed by begin_frame() and end_frame(); in between,
+    mark(phase) charges the time since the previous mark to ``phase``.
+    Phases marked more than once in a frame (one per logic tick, say)
+    add up. Only the last ``capacity`` frames are kept, one row of
+    ``samples`` each, in seconds.
+
+    Code being timed holds a profiler or None and checks for None before
+    marking, so leaving profiling off costs one comparison per phase.
+    """
+
+    def __init__(self, capacity=PROFILE_FRAMES, names=PHASE_NAMES, clock=time.perf_counter):
+        self.names = names
+        self.samples = np.zeros((capacity, len(names)))
+        self.clock = clock
+        self.frames = 0
+        self.row = self.samples[0]
+        self.last = clock()
+
+    def begin_frame(self):
+        self.row = self.samples[self.frames % len(self.samples)]
+        self.row[:] = 0
+        self.last = self.clock()
+
+    def mark(self, phase):
+        now = self.clock()
+        self.row[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        self.frames += 1
+
+    def recorded(self):
+        """The kept frames' samples, oldest first"""
+        capacity = len(self.samples)
+        if self.frames <= capacity:
+            return self.samples[:self.frames]
+        return np.roll(self.samples, -(self.frames % capacity), axis=0)
+
+    def percentiles(self, q=(50, 99)):
+        """Per-phase percentiles over the kept frames, in milliseconds: {name: [values]}"""
+        samples = self.recorded()
+        if not len(samples):
+            return {name: [0.0] * len(q) for name in self.names}
+        table = np.percentile(samples, q, axis=0) * 1000
+        return {name: table[:, i].tolist() for i, name in enumerate(self.names)}
+
+    def summary(self):
+        """One line per phase with its p50 and p99, for an overlay"""
+        return "\n".join(f"{name:<12}{p50:6.2f}{p99:7.2f} ms"
+                         for name, (p50, p99) in self.percentiles().items())
+
+    def export(self, path):
+        """Write the kept frames to path: a summary plus samples as .json, or samples as .csv"""
+        path = Path(path)
+        samples = self.recorded() * 1000
+        if path.suffix == ".csv":
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + tuple(f"{name}_ms" for name in self.names))
+                first = self.frames - len(samples)
+                for i, row in enumerate(samples.tolist()):
+                    writer.writerow([first + i] + [f"{value:.4f}" for value in row])
+        else:
+            stats = {name: {"p50": p50, "p99": p99} for name, (p50, p99) in self.percentiles().items()}
+            with open(path, "w") as f:
+                json.dump({"frames": self.frames, "kept": len(samples), "phases": list(self.names),
+                           "percentiles_ms": stats, "samples_ms": samples.round(4).tolist()}, f)
@@ -0,0 +1,181 @@
+"""Deterministic input recordings for Space Invaders.
+
+A Simulation is fully determined by its seed and the input bitmask it
+is given each tick, so a game is recorded as just that: the seed, the
+inputs packed at three bits a tick, the ticks at which it was restarted,
+and a CRC of the game state every CHECKSUM_INTERVAL ticks so a replay
+can tell exactly where it stopped matching.
+
+    python main.py --seed 42 --record game.sirp    # play and record
+    python main.py --replay game.sirp              # watch it again
+    python invaders_replay.py game.sirp            # verify at full speed
+"""
+
+import argparse
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from invaders_core import Simulation, ALIEN_ROWS, ALIEN_COLS
+
+MAGIC = b"SIRP"
+VERSION = 1
+# magic, version, seed, rows, cols, ticks, checksum interval, restarts, checksums
+HEADER = struct.Struct("<4sHIHHIHII")
+PLAYER = struct.Struct("<ddiii??iii")
+INPUT_BITS = 3
+CHECKSUM_INTERVAL = 60  # one a second at TICK_RATE
+MAX_SEED = 2**32 - 1  # seeds are stored as u32
+
+
+class ReplayMismatch(Exception):
+    """The replayed game state differs from the recorded one"""
+
+
+def state_checksum(sim):
+    """CRC32 of everything in the game state that a tick can change"""
+    player = sim.player
+    crc = zlib.crc32(PLAYER.pack(player.x, player.y, player.lives, player.score,
+                                 player.invulnerable_timer, player.invulnerable, sim.game_over,
+                                 sim.fire_timer, sim.wave, sim.formation.direction))
+    formation = sim.formation
+    projectiles = sim.projectiles
+    for array in (formation.pos, formation.alive, projectiles.pos, projectiles.vel,
+                  projectiles.owner, projectiles.alive, sim.bunkers.mask):
+        crc = zlib.crc32(array, crc)
+    return crc
+
+
+class Recording:
+    """Seed, per-tick inputs, restart ticks and state checksums of one session"""
+
+    def __init__(self, seed, rows=ALIEN_ROWS, cols=ALIEN_COLS, interval=CHECKSUM_INTERVAL):
+        # Checked up front, so a bad seed can't surface only when saving
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"a recorded seed must be between 0 and {MAX_SEED}, not {seed}")
+        self.seed = seed
+        self.rows = rows
+        self.cols = cols
+        self.interval = interval
+        self.inputs = bytearray()
+        self.restarts = []
+        self.checksums = []
+
+    @property
+    def ticks(self):
+        return len(self.inputs)
+
+    def simulation(self):
+        """A fresh Simulation in the state the recording started from"""
+        return Simulation(self.rows, self.cols, seed=self.seed)
+
+    def record(self, inputs, sim):
+        """Log the inputs of the tick sim just ran"""
+        self.inputs.append(inputs)
+        if self.ticks % self.interval == 0:
+            self.checksums.append(state_checksum(sim))
+
+    def restart(self):
+        """Note that the game is reset before the next tick"""
+        self.restarts.append(self.ticks)
+
+    def save(self, path):
+        inputs = np.frombuffer(bytes(self.inputs), dtype=np.uint8)
+        bits = (inputs[:, None] >> np.arange(INPUT_BITS, dtype=np.uint8)) & 1
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.rows, self.cols, self.ticks,
+                                self.interval, len(self.restarts), len(self.checksums)))
+            f.write(np.array(self.restarts, dtype="<u4").tobytes())
+            f.write(np.array(self.checksums, dtype="<u4").tobytes())
+            f.write(np.packbits(bits.ravel(), bitorder="little").tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, rows, cols, ticks, interval, restarts, checksums = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Space Invaders recording")
+
+        recording = cls(seed, rows, cols, interval)
+        offset = HEADER.size
+        recording.restarts = np.frombuffer(data, "<u4", restarts, offset).tolist()
+        offset += 4 * restarts
+        recording.checksums = np.frombuffer(data, "<u4", checksums, offset).tolist()
+        offset += 4 * checksums
+        packed = np.frombuffer(data, np.uint8, offset=offset)
+        bits = np.unpackbits(packed, count=ticks * INPUT_BITS, bitorder="little").reshape(ticks, INPUT_BITS)
+        recording.inputs = bytearray((bits << np.arange(INPUT_BITS, dtype=np.uint8)).sum(axis=1, dtype=np.uint8))
+        return recording
+
+
+class Replayer:
+    """Feeds a Recording back one tick at a time and checks the result"""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.tick = 0
+        self.next_restart = 0
+
+    @property
+    def finished(self):
+        return self.tick >= self.recording.ticks
+
+    def restart_due(self):
+        """True if the game was reset before the upcoming tick"""
+        restarts = self.recording.restarts
+        if self.next_restart < len(restarts) and restarts[self.next_restart] == self.tick:
+            self.next_restart += 1
+            return True
+        return False
+
+    def next_inputs(self):
+        inputs = self.recording.inputs[self.tick]
+        self.tick += 1
+        return inputs
+
+    def check(self, sim):
+        """Compare sim with the recording if a checksum is due; raise ReplayMismatch if it differs"""
+        recording = self.recording
+        if self.tick % recording.interval:
+            return
+        expected = recording.checksums[self.tick // recording.interval - 1]
+        if state_checksum(sim) != expected:
+            raise ReplayMismatch(f"game state differs from the recording at tick {self.tick}")
+
+
+def replay(recording):
+    """Play a recording back headlessly as fast as possible; return the final Simulation"""
+    sim = recording.simulation()
+    replayer = Replayer(recording)
+    while True:
+        if replayer.restart_due():
+            sim.reset()
+        if replayer.finished:
+            return sim
+        sim.step(replayer.next_inputs())
+        replayer.check(sim)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify a Space Invaders recording headlessly")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    start = time.perf_counter()
+    try:
+        sim = replay(recording)
+    except ReplayMismatch as e:
+        print(f"FAILED: {e}")
+        raise SystemExit(1)
+    elapsed = time.perf_counter() - start
+    print(f"OK: {recording.ticks} ticks, {len(recording.checksums)} checksums, "
+          f"{len(recording.restarts)} restarts in {elapsed:.2f}s ({recording.ticks / elapsed:.0f} ticks/s)")
+    print(f"final score {sim.player.score}, wave {sim.wave}, lives {sim.player.lives}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Play many seeded Space Invaders episodes headlessly across all cores.
+
+Each episode is a fresh Simulation driven by a policy until game over
+(or --max-frames). Episodes are spread over a ProcessPoolExecutor and
+reported one line at a time as they finish, followed by percentiles
+over the whole batch:
+
+    python invaders_runner.py --episodes 2000 --policy scripted
+    python invaders_runner.py --episodes 500 --lives 5 --alien-speed 3
+
+Episode i is seeded with --seed + i, so any single line can be
+reproduced with --episodes 1 --seed <its seed>.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from invaders_core import (Simulation, ALIEN_ROWS, ALIEN_COLS, ALIEN_SPEED, FIRE_COOLDOWN,
+                           ALIEN_FIRE_CHANCE, PLAYER_LIVES, PLAYER_SPEED, OWNER_ALIEN,
+                           INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+
+STATS = ("score", "lives_lost", "waves_cleared", "frames")
+PERCENTILES = (5, 25, 50, 75, 95)
+DODGE_RANGE = 60  # how close an alien shot may get overhead before dodging
+
+
+def random_policy(sim, rng):
+    """Any combination of left, right and fire, uniformly"""
+    return int(rng.integers(8))
+
+
+def under_bunker(sim):
+    """True if a shot fired now would hit what is left of a bunker"""
+    bunkers = sim.bunkers
+    x = sim.player.x
+    b = int(np.searchsorted(bunkers.left, x, side="right")) - 1
+    col = int(np.floor(x - bunkers.left[b]))
+    return b >= 0 and 0 <= col < bunkers.width and bool(bunkers.mask[b, :, col].any())
+
+
+def scripted_policy(sim, rng):
+    """Dodge shots overhead, otherwise chase the nearest front-line alien.
+
+    Fires whenever the way up is clear of bunkers.
+    """
+    player = sim.player
+    projectiles = sim.projectiles
+    fire = 0 if under_bunker(sim) else INPUT_FIRE
+
+    shots = projectiles.live(OWNER_ALIEN)
+    if shots.size:
+        pos = projectiles.pos[shots]
+        overhead = (np.abs(pos[:, 0] - player.x) < DODGE_RANGE / 2) & (pos[:, 1] - player.y < DODGE_RANGE * 2)
+        if overhead.any():
+            threat = pos[overhead][:, 0].mean()
+            return fire | (INPUT_LEFT if threat >= player.x else INPUT_RIGHT)
+
+    shooters = sim.formation.shooters()
+    if not shooters.size:
+        return fire
+    xs = sim.formation.pos[shooters, 0]
+    target = xs[np.argmin(np.abs(xs - player.x))]
+    if target < player.x - PLAYER_SPEED:
+        return fire | INPUT_LEFT
+    if target > player.x + PLAYER_SPEED:
+        return fire | INPUT_RIGHT
+    return fire
+
+
+POLICIES = {"random": random_policy, "scripted": scripted_policy}
+
+
+def run_episode(seed, policy="scripted", max_frames=100_000, **sim_options):
+    """Play one game to the end; return its stats as a dict"""
+    sim = Simulation(seed=seed, **sim_options)
+    rng = np.random.default_rng(seed)
+    choose = POLICIES[policy]
+    frames = 0
+    while not sim.game_over and frames < max_frames:
+        sim.step(choose(sim, rng))
+        frames += 1
+    return {
+        "seed": seed,
+        "score": sim.player.score,
+        "lives_lost": sim.player.start_lives - max(0, sim.player.lives),
+        "waves_cleared": sim.wave - 1,
+        "frames": frames,
+        "finished": sim.game_over,
+    }
+
+
+def summarize(results):
+    """Mean and PERCENTILES of every stat over a list of episode results"""
+    summary = {}
+    for stat in STATS:
+        values = np.array([result[stat] for result in results])
+        summary[stat] = {"mean": float(values.mean()),
+                         **{f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}}
+    return summary
+
+
+def print_summary(summary):
+    header = " ".join(f"{'p' + str(p):>8}" for p in PERCENTILES)
+    print(f"{'':<14}{'mean':>8} {header}")
+    for stat, row in summary.items():
+        values = " ".join(f"{row['p' + str(p)]:>8.1f}" for p in PERCENTILES)
+        print(f"{stat:<14}{row['mean']:>8.1f} {values}")
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def grid_size(most):
+    """argparse type for a formation dimension that still fits the playfield"""
+    def parse(text):
+        value = positive_int(text)
+        if value > most:
+            raise argparse.ArgumentTypeError(f"must be at most {most} to fit the playfield, not {value}")
+        return value
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded Space Invaders episodes in parallel")
+    parser.add_argument("--episodes", type=positive_int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="scripted")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count())
+    parser.add_argument("--max-frames", type=positive_int, default=100_000,
+                        help="stop an episode that has not ended after this many ticks")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    balance = parser.add_argument_group("balance")
+    # Bigger grids are packed closer, down to the alien sprite's width
+    balance.add_argument("--rows", type=grid_size(MAX_ALIEN_ROWS), default=ALIEN_ROWS)
+    balance.add_argument("--cols", type=grid_size(MAX_ALIEN_COLS), default=ALIEN_COLS)
+    balance.add_argument("--lives", type=positive_int, default=PLAYER_LIVES)
+    balance.add_argument("--alien-speed", type=float, default=ALIEN_SPEED)
+    balance.add_argument("--alien-fire-chance", type=float, default=ALIEN_FIRE_CHANCE)
+    balance.add_argument("--fire-cooldown", type=int, default=FIRE_COOLDOWN)
+    args = parser.parse_args()
+
+    sim_options = dict(rows=args.rows, cols=args.cols, lives=args.lives, alien_speed=args.alien_speed,
+                       alien_fire_chance=args.alien_fire_chance, fire_cooldown=args.fire_cooldown)
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(run_episode, args.seed + i, args.policy, args.max_frames, **sim_options)
+                   for i in range(args.episodes)]
+        if not args.quiet:
+            print(f"{'seed':>8} {'score':>7} {'lives lost':>10} {'waves':>6} {'frames':>8}")
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not args.quiet:
+                print(f"{result['seed']:>8} {result['score']:>7} {result['lives_lost']:>10} "
+                      f"{result['waves_cleared']:>6} {result['frames']:>8}"
+                      f"{'' if result['finished'] else '  (cut off)'}", flush=True)
+    elapsed = time.perf_counter() - start
+
+    frames = sum(result["frames"] for result in results)
+    print(f"\n{len(results)} episodes, {frames} frames in {elapsed:.1f}s "
+          f"({frames / elapsed:.0f} frames/s on {args.workers} workers)")
+    print_summary(summarize(results))
+
+
+if __name__ == "__main__":
+    main()
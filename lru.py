@@ -0,0 +1,38 @@
+"""A bounded least-recently-used cache, shared by both games' renderers."""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Up to ``maxsize`` values, dropping the least recently used first.
+
+    ``hits`` and ``misses`` count lookups since the cache was made.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def get(self, key, make):
+        """The value cached for key, or make() cached in its place"""
+        if key in self.values:
+            self.hits += 1
+            self.values.move_to_end(key)
+            return self.values[key]
+
+        self.misses += 1
+        value = self.values[key] = make()
+        if len(self.values) > self.maxsize:
+            self.values.popitem(last=False)
+        return value
+
+    def clear(self):
+        self.values.clear()
@@ -1,241 +1,310 @@
+import sys
 import turtle
-import math
+import tkinter
 import random
+import time
+import argparse
 import pygame
 from pygame import mixer
-import os
 from pathlib import Path
+from functools import partial
 
-pygame.mixer.init()
+import numpy as np
 
-SOUND_DIR = Path("sounds")
-SOUND_DIR.mkdir(exist_ok=True)
+from invaders_core import (Simulation, FixedTimestep, Rewind, WIDTH, HEIGHT, REWIND_SECONDS, TICK_RATE,
+                           INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, OWNER_PLAYER, OWNER_ALIEN)
+from invaders_profile import FrameProfiler, PHASE_INPUT, PHASE_EVENTS, PHASE_RENDER, PHASE_PRESENT
+from invaders_replay import Recording, Replayer, MAX_SEED
+from audio import AudioEngine, init_audio
+from lru import LRUCache
 
-screen = turtle.Screen()
-screen.bgcolor("black")
-screen.title("Space Invaders")
-screen.setup(800, 600)
-screen.tracer(0)
+SOUND_DIR = Path("sounds")
+# name: (file, priority, voices, cooldown ms, volume, fallback tone)
+SOUNDS = {
+    "shoot": ("shoot.wav", 1, 2, 80, 0.5, (880, 220, 0.12, 0.0)),
+    "explosion": ("explosion.wav", 2, 4, 30, 0.7, (160, 40, 0.35, 0.8)),
+    "gameover": ("gameover.wav", 3, 1, 1000, 1.0, (440, 110, 1.2, 0.0)),
+}
+
+SPACESHIP_SHAPE = ((-10, -10), (0, 10), (10, -10))
+ALIEN_SHAPE = ((0, 10), (-10, -10), (10, -10))
+SHOT_SHAPE = ((-6, -2), (-6, 2), (6, 2), (6, -2))
+
+# name, x, y, font, align
+HUD_FIELDS = (
+    ("score", -380, 260, ("Arial", 14, "normal"), "left"),
+    ("lives", 280, 260, ("Arial", 14, "normal"), "left"),
+    ("game_over", 0, 0, ("Arial", 30, "bold"), "center"),
+    ("profile", -380, -290, ("Courier", 10, "normal"), "left"),
+)
+
+# --soak plays the same game every time, and fails if memory grows by more
+SOAK_SEED = 1
+SOAK_MEMORY_GROWTH_KIB = 256
+
+screen = None
+
+def setup_screen():
+    """Open the turtle window; only the turtle renderer needs it"""
+    global screen
+    screen = turtle.Screen()
+    screen.bgcolor("black")
+    screen.title("Space Invaders")
+    screen.setup(800, 600)
+    screen.tracer(0)
+
+    screen.register_shape("spaceship", SPACESHIP_SHAPE)
+    screen.register_shape("alien", ALIEN_SHAPE)
+    screen.register_shape("shot", SHOT_SHAPE)
+
+class Keyboard:
+    """Held-key state, read as an input bitmask at the start of each tick"""
+    BINDINGS = {"Left": INPUT_LEFT, "Right": INPUT_RIGHT, "space": INPUT_FIRE}
+    REWIND = "BackSpace"
 
-screen.register_shape("spaceship", ((-10, -10), (0, 10), (10, -10)))
-screen.register_shape("alien", ((0, 10), (-10, -10), (10, -10)))
+    def __init__(self):
+        self.held = set()
+        for key in (*self.BINDINGS, self.REWIND):
+            screen.onkeypress(partial(self.held.add, key), key)
+            screen.onkeyrelease(partial(self.held.discard, key), key)
+
+    def inputs(self):
+        bits = 0
+        for key in self.held:
+            bits |= self.BINDINGS.get(key, 0)
+        return bits
+
+    def rewinding(self):
+        return self.REWIND in self.held
+
+class TurtlePool:
+    """Reusable turtles, so restarts and new waves don't add canvas items"""
+    def __init__(self):
+        # turtle never forgets a Turtle, so released ones wait here for the
+        # next acquire() with the same shape and color
+        self.free = {}
+        self.keys = {}
+        self.created = 0
+
+    def acquire(self, shape, color):
+        key = (shape, color)
+        free = self.free.setdefault(key, [])
+        if free:
+            return free.pop()
+
+        t = turtle.Turtle()
+        t.hideturtle()
+        t.setundobuffer(None)  # Nobody calls undo(); don't keep history
+        t.shape(shape)
+        t.color(color)
+        t.penup()
+        t.speed(0)
+        self.keys[t] = key
+        self.created += 1
+        return t
+
+    def release(self, t):
+        t.clear()
+        t.hideturtle()
+        self.free[self.keys[t]].append(t)
+
+class TurtleHud:
+    """Text fields drawn as fixed canvas items that are edited in place"""
+    ANCHORS = {"left": "sw", "center": "s", "right": "se"}
 
-class SoundManager:
     def __init__(self):
-        self.sounds = {
-            'shoot': pygame.mixer.Sound('sounds/shoot.wav') if os.path.exists('sounds/shoot.wav') else None,
-            'explosion': pygame.mixer.Sound('sounds/explosion.wav') if os.path.exists('sounds/explosion.wav') else None,
-            'gameover': pygame.mixer.Sound('sounds/gameover.wav') if os.path.exists('sounds/gameover.wav') else None
-        }
-    
-    def play(self, sound_name):
-        if self.sounds.get(sound_name):
-            self.sounds[sound_name].play()
+        self.canvas = screen.getcanvas()
+        self.items = {}
+        self.texts = {}
+
+    def add(self, name, x, y, font, align="left", color="white"):
+        # One item per field, unlike turtle.write() which adds one per call;
+        # same placement turtle.write() uses
+        self.items[name] = self.canvas.create_text(
+            x - 1, -y, text="", anchor=self.ANCHORS[align], font=font, fill=color)
+        self.texts[name] = ""
+
+    def set(self, name, text):
+        if self.texts[name] != text:
+            self.canvas.itemconfigure(self.items[name], text=text)
+            self.texts[name] = text
+
+    def close(self):
+        for item in self.items.values():
+            self.canvas.delete(item)
+        self.items.clear()
+        self.texts.clear()
 
 class Player:
-    def __init__(self):
-        self.turtle = turtle.Turtle()
-        self.turtle.shape("spaceship")
-        self.turtle.color("white")
-        self.turtle.penup()
-        self.turtle.speed(0)
-        self.turtle.setposition(0, -250)
+    """Turtle view of a PlayerState"""
+    def __init__(self, state, pool):
+        self.state = state
+        self.turtle = pool.acquire("spaceship", "white")
         self.turtle.setheading(90)
-        self.speed = 15
-        self.respawn_pos = (0, -250)
-        self.invincible_time = 60  # 1 second of invincibility after respawn
-        self.respawn_position = (0, -250)
-        self.blink_timer = 0
-        self.flash_timer = 0  # Add this line
-        self.score = 0
-        self.invulnerable = False
-        self.invulnerable_timer = 0
-        self.reset()
-    
-    def reset(self):
-        self.lives = 3
-        self.score = 0
-        self.turtle.showturtle()
-        self.turtle.setposition(0, -250)
-        self.invulnerable = False
-        self.invulnerable_timer = 0
-        self.blink_timer = 0
-        self.flash_timer = 0  # Add this line
-
-    def move_left(self):
-        x = self.turtle.xcor()
-        x -= self.speed
-        if x < -380:
-            x = -380
-        self.turtle.setx(x)
-
-    def move_right(self):
-        x = self.turtle.xcor()
-        x += self.speed
-        if x > 380:
-            x = 380
-        self.turtle.setx(x)
-
-    def hit(self):
-        if not self.invulnerable:
-            self.lives -= 1
-            self.invulnerable = True
-            self.invulnerable_timer = 60
-            return True
-        return False
-        
-    def reset_position(self):
-        self.turtle.setposition(*self.respawn_pos)
-        self.invulnerable = True
-        self.invulnerable_timer = 120  # 2 seconds of invulnerability
-        self.flash_timer = 0
-        self.turtle.showturtle()
-
-    def respawn(self):
-        self.turtle.setposition(0, -250)
-        self.invulnerable = True
-        self.invulnerable_timer = 60  # 1 second invincibility
-        self.blink_timer = 0
-        self.flash_timer = 0  # Add this line
-        self.turtle.showturtle()
-
-    def update(self):
-        if self.invulnerable:
-            self.invulnerable_timer -= 1
-            self.blink_timer += 1
-            
-            # Simplified blinking effect
-            if self.blink_timer % 6 == 0:
-                if self.turtle.isvisible():
-                    self.turtle.hideturtle()
-                else:
-                    self.turtle.showturtle()
-                    
-            if self.invulnerable_timer <= 0:
-                self.invulnerable = False
+        self.drawn_pos = None
+        self.sync()
+
+    def sync(self):
+        # Only touch Tk when something actually changed
+        pos = (self.state.x, self.state.y)
+        if pos != self.drawn_pos:
+            self.turtle.setposition(*pos)
+            self.drawn_pos = pos
+        if self.state.visible != self.turtle.isvisible():
+            if self.state.visible:
                 self.turtle.showturtle()
-
-class Bullet:
-    def __init__(self):
-        self.turtle = turtle.Turtle()
-        self.turtle.shape("circle")
-        self.turtle.color("yellow")
-        self.turtle.penup()
-        self.turtle.speed(0)
-        self.turtle.hideturtle()
-        self.turtle.setheading(90)
-        self.speed = 20
-        self.state = "ready"
-
-    def fire(self, x, y):
-        if self.state == "ready":
-            self.state = "fired"
-            self.turtle.setposition(x, y + 10)
-            self.turtle.showturtle()
-
-    def move(self):
-        if self.state == "fired":
-            y = self.turtle.ycor()
-            y += self.speed
-            self.turtle.sety(y)
-            if y > 275:
+            else:
                 self.turtle.hideturtle()
-                self.state = "ready"
 
-class Alien:
-    def __init__(self, x, y):
-        self.turtle = turtle.Turtle()
-        self.turtle.shape("alien")
-        self.turtle.color("green")
-        self.turtle.penup()
-        self.turtle.speed(0)
-        self.turtle.setposition(x, y)
-        self.speed = 2
-        self.direction = 1
+class Shots:
+    """Turtle views for the live projectiles"""
+    LOOKS = {OWNER_PLAYER: ("circle", "yellow"), OWNER_ALIEN: ("shot", "red")}
+
+    def __init__(self, projectiles, pool):
+        self.projectiles = projectiles
+        self.pool = pool
+        self.turtles = {owner: [] for owner in self.LOOKS}
+        self.drawn = {owner: [] for owner in self.LOOKS}
+
+    def sync(self):
+        for owner, turtles in self.turtles.items():
+            drawn = self.drawn[owner]
+            slots = self.projectiles.live(owner)
+            while len(turtles) < len(slots):
+                turtles.append(self.pool.acquire(*self.LOOKS[owner]))
+                drawn.append(None)
+
+            for i, pos in enumerate(self.projectiles.pos[slots].tolist()):
+                t = turtles[i]
+                pos = tuple(pos)
+                if pos != drawn[i]:
+                    t.setposition(*pos)
+                    drawn[i] = pos
+                if not t.isvisible():
+                    t.showturtle()
+            # Turtles are kept between frames; the ones left over are hidden
+            for t in turtles[len(slots):]:
+                if t.isvisible():
+                    t.hideturtle()
+
+    def release(self):
+        for owner, turtles in self.turtles.items():
+            for t in turtles:
+                self.pool.release(t)
+            turtles.clear()
+            self.drawn[owner].clear()
 
-class Game:
-    def __init__(self):
-        self.running = True
-        self.player = Player()
-        self.bullet = Bullet()
+class Alien:
+    """Turtle view of one slot in the simulation's alien formation"""
+    def __init__(self, formation, index, pool):
+        self.formation = formation
+        self.index = index
+        self.turtle = pool.acquire("alien", "green")
+        self.drawn_pos = None
+        self.sync()
+
+    def sync(self):
+        if not self.formation.alive[self.index]:
+            if self.turtle.isvisible():
+                self.turtle.hideturtle()
+            return
+        if not self.turtle.isvisible():
+            self.turtle.showturtle()
+        x, y = self.formation.pos[self.index]
+        pos = (float(x), float(y))
+        if pos != self.drawn_pos:
+            self.turtle.setposition(*pos)
+            self.drawn_pos = pos
+
+class Bunkers:
+    """Turtle view of the simulation's Bunkers, one Tk PhotoImage each"""
+    COLOR = "#00ff00"
+    ERASED = "black"  # the screen background
+
+    def __init__(self, bunkers):
+        self.bunkers = bunkers
+        self.canvas = screen.getcanvas()
+        self.images = []
+        self.items = []
+        for left in bunkers.left:
+            image = tkinter.PhotoImage(master=self.canvas, width=bunkers.width, height=bunkers.height)
+            item = self.canvas.create_image(int(left), -bunkers.top, image=image, anchor="nw")
+            # Keep the bunkers underneath the turtles
+            self.canvas.tag_lower(item)
+            self.images.append(image)
+            self.items.append(item)
+        self.sync()
+
+    def sync(self):
+        # Only the regions the simulation marked dirty are uploaded again
+        mask = self.bunkers.mask
+        for b, x0, y0, x1, y1 in self.bunkers.pop_dirty():
+            block = np.where(mask[b, y0:y1, x0:x1], self.COLOR, self.ERASED)
+            data = " ".join("{" + " ".join(row) + "}" for row in block)
+            self.images[b].put(data, to=(x0, y0))
+
+    def close(self):
+        for item in self.items:
+            self.canvas.delete(item)
+        self.items.clear()
+        self.images.clear()
+
+class TurtleView:
+    """Draws the simulation on a turtle (Tk canvas) screen"""
+    def __init__(self, game):
+        setup_screen()
+        self.game = game
+        self.sim = game.sim
+        self.pool = TurtlePool()
+        self.player = Player(self.sim.player, self.pool)
+        self.shots = Shots(self.sim.projectiles, self.pool)
+        self.bunkers = Bunkers(self.sim.bunkers)
         self.aliens = []
-        self.sound_manager = SoundManager()
-        self.game_over = False
-        self.game_over_text = None  # Add this line to track game over text
-        self.game_over_pen = None  # Add this to track game over message
-        
+
         self.setup_display()
         self.setup_lives_display()
-        
+
         self.setup_aliens()
         self.setup_controls()
-        self.reset_game()
+        screen.update()
 
     def cleanup(self):
-        """Clean up all turtle objects"""
+        """Hand every turtle back to the pool"""
         for alien in self.aliens:
-            alien.turtle.hideturtle()
-            alien.turtle.clear()
+            self.pool.release(alien.turtle)
         self.aliens.clear()
-        
-        if self.game_over_text:
-            self.game_over_text.clear()
-            self.game_over_text.hideturtle()
-        
-        self.score_pen.clear()
-        self.lives_pen.clear()
-        
+
+        self.hud.close()
+
         for life in self.life_icons:
-            life.clear()
-            life.hideturtle()
-        
-        self.player.turtle.clear()
-        self.player.turtle.hideturtle()
-        self.bullet.turtle.clear()
-        self.bullet.turtle.hideturtle()
-
-    def reset_game(self):
-        # Clear everything properly first
+            self.pool.release(life)
+        self.life_icons.clear()
+
+        self.pool.release(self.player.turtle)
+        self.shots.release()
+
+    def close(self):
         self.cleanup()
-        
-        # Create fresh objects
-        self.player = Player()
-        self.bullet = Bullet()
-        self.aliens = []
-        self.game_over = False
-        self.game_over_text = None
-        
-        # Setup new game
+        self.bunkers.close()
+        screen.clear()
+        screen.bye()
+
+    def reset(self):
+        # The views and their turtles are reused as they are
         self.setup_aliens()
-        self.setup_lives_display()
-        self.update_score()
+        self.render()
+        self.update_lives_display()
         screen.update()
 
     def setup_display(self):
-        self.score_pen = turtle.Turtle()
-        self.score_pen.speed(0)
-        self.score_pen.color("white")
-        self.score_pen.penup()
-        self.score_pen.hideturtle()
-        self.score_pen.goto(-380, 260)
-        
-        self.lives_pen = turtle.Turtle()
-        self.lives_pen.speed(0)
-        self.lives_pen.color("white")
-        self.lives_pen.penup()
-        self.lives_pen.hideturtle()
-        self.lives_pen.goto(280, 260)
-        
-        self.update_score()
+        self.hud = TurtleHud()
+        for field in HUD_FIELDS:
+            self.hud.add(*field)
 
     def setup_lives_display(self):
         self.life_icons = []
         for i in range(3):
-            life = turtle.Turtle()
-            life.shape("spaceship")
-            life.color("green")
-            life.penup()
-            life.hideturtle()
+            life = self.pool.acquire("spaceship", "green")
             life.goto(280 + i * 30, 260)
             life.setheading(90)
             life.showturtle()
@@ -243,171 +312,524 @@ class Game:
 
     def update_lives_display(self):
         for i, life in enumerate(self.life_icons):
-            if i < self.player.lives:
-                life.showturtle()
-            else:
-                life.hideturtle()
+            shown = i < self.sim.player.lives
+            if shown != life.isvisible():
+                if shown:
+                    life.showturtle()
+                else:
+                    life.hideturtle()
 
     def setup_aliens(self):
-        for i in range(5):
-            for j in range(11):
-                alien = Alien(-250 + j * 50, 200 - i * 40)
-                self.aliens.append(alien)
+        """Give every formation slot a view, reusing the ones we already have"""
+        formation = self.sim.formation
+        slots = len(formation.alive)
+        while len(self.aliens) > slots:
+            self.pool.release(self.aliens.pop().turtle)
+        for alien in self.aliens:
+            alien.formation = formation
+        while len(self.aliens) < slots:
+            self.aliens.append(Alien(formation, len(self.aliens), self.pool))
 
     def setup_controls(self):
-        screen.onkey(self.player.move_left, "Left")
-        screen.onkey(self.player.move_right, "Right")
-        screen.onkey(self.fire_bullet, "space")
-        screen.onkey(self.handle_restart, "r")
+        self.keyboard = Keyboard()
+        screen.onkey(self.game.handle_restart, "r")
+        screen.onkey(self.game.quit, "Escape")
         screen.listen()
 
-    def handle_restart(self):
-        if self.game_over:
-            self.reset_game()
+    def inputs(self):
+        return self.keyboard.inputs()
+
+    def rewinding(self):
+        return self.keyboard.rewinding()
+
+    def pump(self):
+        # Tk delivers key events during screen.update() in present()
+        pass
+
+    def render(self):
+        self.bunkers.sync()
+        self.player.sync()
+        self.shots.sync()
+        for alien in self.aliens:
+            alien.sync()
+
+    def present(self):
+        screen.update()
 
-    def fire_bullet(self):
-        if self.bullet.state == "ready":
-            self.sound_manager.play('shoot')
-            self.bullet.fire(self.player.turtle.xcor(), self.player.turtle.ycor())
+def to_pixels(x, y):
+    """Turtle coordinates (origin in the centre, y up) to pygame pixels"""
+    return int(x + WIDTH / 2), int(HEIGHT / 2 - y)
+
+def polygon_sprite(shape, color, heading):
+    """Pre-render a registered turtle shape as it looks at the given heading"""
+    # Turtle shapes point along their +y axis; turn that onto the heading
+    points = [pygame.math.Vector2(p).rotate(heading - 90) for p in shape]
+    sprite = pygame.Surface((21, 21), pygame.SRCALPHA)
+    pygame.draw.polygon(sprite, color, [(10 + p.x, 10 - p.y) for p in points])
+    return sprite
+
+class PygameHud:
+    """Text fields for the pygame view, rendered only when they change"""
+    CACHE_SIZE = 64  # lines that come back around, like lives counts, are not rendered again
+
+    def __init__(self):
+        self.fields = {}
+        self.fonts = {}
+        self.cache = LRUCache(self.CACHE_SIZE)
+        self.sprites = []
+
+    def add(self, name, x, y, font, align="left", color="white"):
+        family, size, style = font
+        if font not in self.fonts:
+            # Turtle font sizes are points; pygame wants pixels
+            self.fonts[font] = pygame.font.SysFont(family, round(size * 4 / 3), bold=style == "bold")
+        self.fields[name] = {"font": font, "pos": to_pixels(x, y), "align": align,
+                             "color": color, "text": "", "sprites": []}
+
+    def render_line(self, font, line, color):
+        return self.cache.get((font, line, color), lambda: self.fonts[font].render(line, True, color))
+
+    def set(self, name, text):
+        field = self.fields[name]
+        if field["text"] == text:
+            return
+        field["text"] = text
+
+        # Anchor the bottom of the block on the field position, like turtle
+        x, bottom = field["pos"]
+        lines = [self.render_line(field["font"], line, field["color"])
+                 for line in text.split("\n")] if text else []
+        sprites = []
+        for surface in reversed(lines):
+            rect = surface.get_rect()
+            if field["align"] == "center":
+                rect.midbottom = (x, bottom)
+            elif field["align"] == "right":
+                rect.bottomright = (x, bottom)
+            else:
+                rect.bottomleft = (x, bottom)
+            sprites.append((surface, rect))
+            bottom = rect.top
+        field["sprites"] = sprites
+        self.sprites = [sprite for f in self.fields.values() for sprite in f["sprites"]]
+
+class PygameView:
+    """Draws the simulation with pygame, from sprites rendered once"""
+    KEYS = {pygame.K_LEFT: INPUT_LEFT, pygame.K_RIGHT: INPUT_RIGHT, pygame.K_SPACE: INPUT_FIRE}
+
+    def __init__(self, game):
+        self.game = game
+        self.sim = game.sim
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_caption("Space Invaders")
+        self.surface = pygame.display.set_mode((WIDTH, HEIGHT))
+
+        self.ship_sprite = polygon_sprite(SPACESHIP_SHAPE, "white", 90)
+        self.life_sprite = polygon_sprite(SPACESHIP_SHAPE, "green", 90)
+        self.alien_sprite = polygon_sprite(ALIEN_SHAPE, "green", 0)
+        bullet_sprite = pygame.Surface((21, 21), pygame.SRCALPHA)
+        pygame.draw.circle(bullet_sprite, "yellow", (10, 10), 10)
+        self.shot_sprites = {OWNER_PLAYER: bullet_sprite,
+                             OWNER_ALIEN: polygon_sprite(SHOT_SHAPE, "red", 0)}
+
+        self.setup_bunkers()
+
+        self.hud = PygameHud()
+        for field in HUD_FIELDS:
+            self.hud.add(*field)
+        self.setup_lives_display()
 
-    def check_collision(self, t1, t2, threshold=20):
-        distance = math.sqrt(
-            math.pow(t1.xcor() - t2.xcor(), 2) +
-            math.pow(t1.ycor() - t2.ycor(), 2)
-        )
-        return distance < threshold
+    def close(self):
+        pygame.display.quit()
+
+    def reset(self):
+        self.update_lives_display()
+
+    def setup_lives_display(self):
+        self.life_icons = []
+        for i in range(3):
+            x, y = to_pixels(280 + i * 30, 260)
+            self.life_icons.append((self.life_sprite, (x - 10, y - 10)))
+        self.update_lives_display()
+
+    def update_lives_display(self):
+        self.visible_lives = self.life_icons[:max(0, self.sim.player.lives)]
+
+    def setup_aliens(self):
+        # Aliens are drawn straight from the formation arrays
+        pass
+
+    def setup_bunkers(self):
+        """One green surface per bunker whose alpha channel mirrors its mask"""
+        bunkers = self.sim.bunkers
+        self.bunker_sprites = []
+        for left in bunkers.left:
+            sprite = pygame.Surface((bunkers.width, bunkers.height), pygame.SRCALPHA)
+            sprite.fill("green")
+            self.bunker_sprites.append((sprite, to_pixels(left, bunkers.top)))
+        self.sync_bunkers()
+
+    def sync_bunkers(self):
+        """Copy only the dirty parts of the bunker masks into the sprites' alpha"""
+        bunkers = self.sim.bunkers
+        for b, x0, y0, x1, y1 in bunkers.pop_dirty():
+            alpha = pygame.surfarray.pixels_alpha(self.bunker_sprites[b][0])
+            # surfarray indexes pixels as [x, y]
+            alpha[x0:x1, y0:y1] = bunkers.mask[b, y0:y1, x0:x1].T * 255
+            del alpha  # unlocks the surface
+
+    def inputs(self):
+        pressed = pygame.key.get_pressed()
+        bits = 0
+        for key, bit in self.KEYS.items():
+            if pressed[key]:
+                bits |= bit
+        return bits
+
+    def rewinding(self):
+        return pygame.key.get_pressed()[pygame.K_BACKSPACE]
+
+    def pump(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.game.quit()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.game.quit()
+                elif event.key == pygame.K_r:
+                    self.game.handle_restart()
+
+    def place(self, sprite, positions):
+        """Blit list entries centring sprite on each row of an (n, 2) array"""
+        xs = (positions[:, 0] + (WIDTH / 2 - 10)).astype(int).tolist()
+        ys = ((HEIGHT / 2 - 10) - positions[:, 1]).astype(int).tolist()
+        return [(sprite, pos) for pos in zip(xs, ys)]
+
+    def render(self):
+        self.surface.fill("black")
+        self.sync_bunkers()
+
+        formation = self.sim.formation
+        sprites = list(self.bunker_sprites)
+        sprites.extend(self.place(self.alien_sprite, formation.pos[formation.alive]))
+
+        player = self.sim.player
+        if player.visible:
+            x, y = to_pixels(player.x, player.y)
+            sprites.append((self.ship_sprite, (x - 10, y - 10)))
+
+        projectiles = self.sim.projectiles
+        for owner, sprite in self.shot_sprites.items():
+            sprites.extend(self.place(sprite, projectiles.pos[projectiles.live(owner)]))
+
+        sprites.extend(self.visible_lives)
+        sprites.extend(self.hud.sprites)
+
+        # One call for the whole frame, however big the formation
+        self.surface.blits(sprites, doreturn=False)
+
+    def present(self):
+        pygame.display.flip()
+
+class HeadlessHud:
+    """HUD that only remembers its text"""
+    def __init__(self):
+        self.texts = {name: "" for name, *_ in HUD_FIELDS}
+
+    def set(self, name, text):
+        self.texts[name] = text
+
+class HeadlessView:
+    """A view that draws nothing, for driving Game from scripts and benchmarks"""
+    def __init__(self, game):
+        self.game = game
+        self.held = 0  # input bitmask, set by the driver
+        self.hud = HeadlessHud()
+
+    def close(self):
+        pass
+
+    def reset(self):
+        pass
+
+    def update_lives_display(self):
+        pass
+
+    def setup_aliens(self):
+        pass
+
+    def inputs(self):
+        return self.held
+
+    def rewinding(self):
+        return False
+
+    def pump(self):
+        pass
+
+    def render(self):
+        pass
+
+    def present(self):
+        pass
+
+RENDERERS = {"turtle": TurtleView, "pygame": PygameView}
+
+class Game:
+    """Runs the simulation behind a view, recording, replaying or keeping a rewind buffer"""
+    def __init__(self, view_class=TurtleView, seed=None, record=False, replay=None,
+                 rewind_seconds=REWIND_SECONDS, profiler=None, **sim_options):
+        self.running = True
+        self.profiler = profiler
+        self.replay = None
+        self.recording = None
+        self.rewind = None
+        if replay is not None:
+            self.replay = Replayer(replay)
+            self.sim = replay.simulation()
+        else:
+            if seed is None:
+                seed = random.getrandbits(32)
+            self.sim = Simulation(seed=seed, **sim_options)
+            if record:
+                self.recording = Recording(seed, self.sim.formation.rows, self.sim.formation.cols)
+            elif rewind_seconds > 0:
+                # Recordings only hold inputs, so there is no rewinding while recording or replaying
+                self.rewind = Rewind(self.sim, rewind_seconds)
+                self.rewind.snapshot()
+        self.sim.profiler = profiler
+        self.sound_manager = AudioEngine(SOUNDS, SOUND_DIR)
+        self.view = view_class(self)
+        self.update_score()
+
+    @property
+    def game_over(self):
+        return self.sim.game_over
+
+    def reset_game(self, seed=None):
+        if self.recording is not None:
+            self.recording.restart()
+        self.sim.reset(seed)
+        if self.rewind is not None:
+            self.rewind.clear()
+            self.rewind.snapshot()
+        self.view.reset()
+        self.view.hud.set("game_over", "")
+        self.update_score()
 
     def update_score(self):
-        self.score_pen.clear()
-        self.score_pen.write(
-            f"Score: {self.player.score}", 
-            font=("Arial", 14, "normal")
-        )
-        self.lives_pen.clear()
-        self.lives_pen.write(
-            f"Lives: {self.player.lives}", 
-            font=("Arial", 14, "normal")
-        )
+        self.view.hud.set("score", f"Score: {self.sim.player.score}")
+        self.view.hud.set("lives", f"Lives: {self.sim.player.lives}")
 
     def show_game_over(self):
-        self.sound_manager.play('gameover')
-        
-        # Clear previous game over text if it exists
-        if self.game_over_text is not None:
-            self.game_over_text.clear()
-            self.game_over_text.hideturtle()
-        
-        # Create new game over text
-        self.game_over_text = turtle.Turtle()
-        self.game_over_text.speed(0)
-        self.game_over_text.color("white")
-        self.game_over_text.penup()
-        self.game_over_text.hideturtle()
-        self.game_over_text.goto(0, 0)
-        self.game_over_text.write("GAME OVER\nPRESS R TO RESTART", 
-                                 align="center", 
-                                 font=("Arial", 30, "bold"))
-
-    def handle_collision(self):
-        if not self.player.invulnerable:
-            self.player.lives -= 1
-            self.update_lives_display()
-            self.sound_manager.play('explosion')
-            
-            if self.player.lives <= 0:
-                self.game_over = True
+        self.view.hud.set("game_over", "GAME OVER\nPRESS R TO RESTART")
+
+    def rewind_tick(self):
+        """Go back one tick and bring the HUD in line with the restored state"""
+        if not self.rewind.rewind():
+            return
+        self.view.update_lives_display()
+        self.update_score()
+        if self.game_over:
+            self.show_game_over()
+        else:
+            self.view.hud.set("game_over", "")
+
+    def handle_restart(self):
+        # A replay restarts only where the recorded game did
+        if self.game_over and self.replay is None:
+            self.reset_game()
+
+    def quit(self):
+        self.running = False
+
+    def handle_events(self, events):
+        """React to what happened during the last simulation step"""
+        for event in events:
+            if event in ('shoot', 'explosion'):
+                self.sound_manager.play(event)
+            elif event == 'lives':
+                self.view.update_lives_display()
+                self.update_score()
+            elif event == 'score':
+                self.update_score()
+            elif event == 'wave':
+                self.view.setup_aliens()
+            elif event == 'gameover':
+                self.sound_manager.play('gameover')
                 self.show_game_over()
-            else:
-                # Just respawn player, keep aliens in current position
-                self.player.respawn()
-                self.bullet.state = "ready"
-                self.bullet.turtle.hideturtle()
-            return True
-        return False
+
+    def render(self):
+        self.view.render()
 
     def update(self):
+        """Run one logic tick; drawing is left to render()"""
+        if self.replay is not None:
+            if self.replay.restart_due():
+                self.reset_game()
+            if self.replay.finished:
+                self.running = False
+                return
+
+        if self.rewind is not None and self.view.rewinding():
+            self.rewind_tick()
+            return
+
         if self.game_over:
             return
 
-        screen.update()
-        
-        self.player.update()
-        self.bullet.move()
+        if self.replay is not None:
+            inputs = self.replay.next_inputs()
+        else:
+            inputs = self.view.inputs()
+        if self.profiler is not None:
+            self.profiler.mark(PHASE_INPUT)
+        self.sim.step(inputs)
+        if self.recording is not None:
+            self.recording.record(inputs, self.sim)
+        elif self.replay is not None:
+            self.replay.check(self.sim)
+        elif self.rewind is not None:
+            self.rewind.snapshot()
+        self.handle_events(self.sim.events)
+        if self.profiler is not None:
+            self.profiler.mark(PHASE_EVENTS)
+
+def main(view_class=TurtleView, seed=None, record=None, replay=None, rewind_seconds=REWIND_SECONDS,
+         profile=None, overlay=False):
+    """Play (or watch a replay of) the game, optionally recording or profiling it"""
+    if replay is not None:
+        replay = Recording.load(replay)
+    init_audio(SOUND_DIR)
+    profiler = FrameProfiler() if profile or overlay else None
+    game = Game(view_class, seed, record is not None, replay, rewind_seconds, profiler)
+    timestep = FixedTimestep()
 
-        # Check collisions in a safe way
-        aliens_to_remove = []
-        for alien in self.aliens:
-            x = alien.turtle.xcor()
-            x += alien.speed * alien.direction
-            alien.turtle.setx(x)
-
-            # Check for wall collision
-            if x > 380 or x < -380:
-                for a in self.aliens:
-                    y = a.turtle.ycor()
-                    y -= 40
-                    a.turtle.sety(y)
-                    a.direction *= -1
-                    if y < -230:
-                        # Remove game over here - just take away a life
-                        if not self.player.invulnerable:
-                            self.handle_collision()
-                        return
-
-            # Check collision with player
-            if self.check_collision(self.player.turtle, alien.turtle, 30):
-                if self.handle_collision():
-                    continue  # Continue playing if lives remain
-
-            # Check collision with bullet
-            if self.bullet.state == "fired" and self.check_collision(self.bullet.turtle, alien.turtle):
-                self.sound_manager.play('explosion')
-                self.bullet.turtle.hideturtle()
-                self.bullet.state = "ready"
-                aliens_to_remove.append(alien)
-                self.player.score += 10
-
-        # Remove destroyed aliens and update score
-        for alien in aliens_to_remove:
-            alien.turtle.hideturtle()
-            self.aliens.remove(alien)
-        
-        if aliens_to_remove:
-            self.update_score()
-            if not self.aliens:
-                self.setup_aliens()
-
-def main():
-    game = Game()
-    
     try:
-        # Main game loop
+        # Main game loop: logic at a fixed rate, one redraw per pass
         while game.running:
             try:
-                # Handle quit event
-                for event in screen.getcanvas().winfo_children():
-                    if hasattr(event, 'type') and event.type == turtle.QUIT:
-                        game.running = False
-                        break
-                
-                screen.onkey(game.handle_restart, "r")
-                screen.onkey(lambda: setattr(game, 'running', False), "Escape")  # Add escape to quit
-                screen.listen()
-                
-                game.update()
-                screen.update()
-                
+                if profiler is not None:
+                    profiler.begin_frame()
+                game.view.pump()
+                if profiler is not None:
+                    profiler.mark(PHASE_INPUT)
+
+                ticks = timestep.due()
+                for _ in range(ticks):
+                    game.update()
+                if ticks:
+                    game.render()
+                    if profiler is not None:
+                        profiler.mark(PHASE_RENDER)
+                game.view.present()
+
+                # Passes that ran no tick are idle polling, not frames
+                if profiler is not None and ticks:
+                    profiler.mark(PHASE_PRESENT)
+                    profiler.end_frame()
+                    if overlay and profiler.frames % TICK_RATE == 0:
+                        game.view.hud.set("profile", profiler.summary())
+                timestep.wait()
+
             except Exception as e:
                 print(f"Error in game loop: {e}")
                 break
-                
+
     finally:
-        # Clean up properly
-        game.cleanup()
-        screen.clear()
-        screen.bye()
+        try:
+            if game.recording is not None:
+                game.recording.save(record)
+                print(f"Recorded {game.recording.ticks} ticks to {record}")
+            if profile:
+                profiler.export(profile)
+                print(f"Saved {min(profiler.frames, len(profiler.samples))} frame timings to {profile}")
+        finally:
+            # Clean up properly, even if saving failed
+            game.view.close()
+            game.sound_manager.close()
+            pygame.mixer.quit()
+            pygame.quit()
+
+def soak(restarts, frames_per_game=120):
+    """Play and restart the game over and over; return True if nothing grew"""
+    import tracemalloc
+
+    init_audio(SOUND_DIR)
+    game = Game(seed=SOAK_SEED)
+    game.view.keyboard.held.add("space")  # Keep firing
+    tracemalloc.start()
+    report_every = max(1, restarts // 10)
+    # Every game is the same one, so the first takes as many turtles and
+    # canvas items as any will; after it, nothing may grow
+    baseline = None
+    print(f"{'restart':>8} {'turtles':>8} {'canvas items':>13} {'memory KiB':>11} {'frame ms':>9}")
+
+    try:
+        for restart in range(1, restarts + 1):
+            start = time.perf_counter()
+            for _ in range(frames_per_game):
+                game.update()
+                game.render()
+                game.view.present()
+            frame_ms = (time.perf_counter() - start) * 1000 / frames_per_game
+
+            game.show_game_over()
+            game.reset_game(SOAK_SEED)
+
+            usage = (len(screen.turtles()), len(screen.getcanvas().find_all()),
+                     tracemalloc.get_traced_memory()[0] / 1024)
+            if baseline is None:
+                baseline = usage
+            if restart == 1 or restart % report_every == 0 or restart == restarts:
+                print(f"{restart:>8} {usage[0]:>8} {usage[1]:>13} {usage[2]:>11.1f} {frame_ms:>9.2f}")
+    finally:
+        tracemalloc.stop()
+        game.view.close()
+        game.sound_manager.close()
         pygame.mixer.quit()
         pygame.quit()
 
+    turtles, items, memory = usage
+    problems = []
+    if turtles != baseline[0]:
+        problems.append(f"turtles went from {baseline[0]} to {turtles}")
+    if items != baseline[1]:
+        problems.append(f"canvas items went from {baseline[1]} to {items}")
+    if memory - baseline[2] > SOAK_MEMORY_GROWTH_KIB:
+        problems.append(f"traced memory grew by {memory - baseline[2]:.1f} KiB "
+                        f"(allowed {SOAK_MEMORY_GROWTH_KIB} KiB)")
+    for problem in problems:
+        print(f"FAIL: {problem} after {restarts} restarts")
+    return not problems
+
+def seed(text):
+    value = int(text)
+    if not 0 <= value <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f"must be between 0 and {MAX_SEED}, not {value}")
+    return value
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="turtle",
+                        help="draw with turtle (Tk canvas) or pygame (default: turtle)")
+    parser.add_argument("--soak", type=int, metavar="RESTARTS",
+                        help="restart the game RESTARTS times, report memory and frame time, "
+                             "and exit with status 1 if turtles, canvas items or memory grew")
+    parser.add_argument("--seed", type=seed, help=f"seed the game for a reproducible run (0 to {MAX_SEED})")
+    parser.add_argument("--record", metavar="FILE", help="save this game's inputs to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="watch a game recorded with --record")
+    parser.add_argument("--rewind-seconds", type=float, default=REWIND_SECONDS,
+                        help=f"how far back Backspace can rewind; 0 turns it off (default: {REWIND_SECONDS})")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="time each phase of every frame and save the timings to FILE (.json or .csv) on exit")
+    parser.add_argument("--profile-overlay", action="store_true",
+                        help="show per-phase p50/p99 frame timings on screen")
+    args = parser.parse_args()
+
+    if args.soak:
+        sys.exit(0 if soak(args.soak) else 1)
+    else:
+        main(RENDERERS[args.renderer], args.seed, args.record, args.replay, args.rewind_seconds,
+             args.profile, args.profile_overlay)
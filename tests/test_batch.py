@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from invaders_core import (BatchSimulation, Simulation, INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT,
+                           OWNER_ALIEN, PLAYER_SPEED, WAVES, BULLET_OFFSET, MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+from invaders_env import VecEnv
+
+
+def gap_inputs(game, tick, x):
+    """Sweep and fire without leaving the gap between the middle bunkers, so no shot hits one"""
+    move = INPUT_RIGHT if (tick // (3 + game)) % 2 else INPUT_LEFT
+    if abs(x + (PLAYER_SPEED if move == INPUT_RIGHT else -PLAYER_SPEED)) > 49:
+        move = 0
+    return move | (INPUT_FIRE if (tick + game) % (1 + game % 3) == 0 else 0)
+
+
+def game_state(batch, g):
+    return (batch.player_x[g], batch.lives[g], batch.score[g], batch.wave[g], batch.game_over[g],
+            batch.invulnerable[g], batch.visible[g], batch.fire_timer[g], *batch.origin[g],
+            batch.direction[g], batch.alive[g].tolist(), batch.shot_alive[g].tolist(),
+            batch.shot_pos[g][batch.shot_alive[g]].tolist(), batch.bunkers[g].tolist())
+
+
+def sim_state(sim):
+    player, formation, shots = sim.player, sim.formation, sim.projectiles
+    return (player.x, player.lives, player.score, sim.wave, sim.game_over, player.invulnerable,
+            player.visible, sim.fire_timer, formation.origin_x, formation.origin_y, formation.direction,
+            formation.alive.tolist(), shots.alive.tolist(), shots.pos[shots.alive].tolist(),
+            sim.bunkers.mask.tolist())
+
+
+@pytest.mark.parametrize("rows, cols, ticks", [(3, 4, 2000), (MAX_ALIEN_ROWS, MAX_ALIEN_COLS, 1200)])
+def test_batch_plays_like_separate_simulations(rows, cols, ticks):
+    # With alien fire off and no shot reaching a bunker nothing is random, so
+    # every game must match a Simulation fed the same inputs: waves cleared
+    # on the small grid, trampled bunkers and invasions on the big one
+    batch = BatchSimulation(4, rows, cols, alien_fire_chance=0)
+    sims = [Simulation(rows, cols, alien_fire_chance=0) for _ in range(4)]
+    for tick in range(ticks):
+        # Past the table the escalated speeds aren't exact in binary
+        if batch.wave.max() > len(WAVES):
+            break
+        inputs = [gap_inputs(g, tick, batch.player_x[g]) for g in range(4)]
+        batch.step(np.array(inputs))
+        for g, sim in enumerate(sims):
+            sim.step(inputs[g])
+            if tick % 50 == 0:
+                assert game_state(batch, g) == sim_state(sim), tick
+    for g, sim in enumerate(sims):
+        assert game_state(batch, g) == sim_state(sim)
+    assert batch.wave.max() > 1 or batch.game_over.all()
+
+
+def test_batch_alien_fire_comes_from_the_front_line():
+    batch = BatchSimulation(32, alien_fire_chance=1, seed=0)
+    rng = np.random.default_rng(1)
+    for tick in range(300):
+        before = batch.shot_alive & (batch.shot_owner == OWNER_ALIEN)
+        origin = batch.origin.copy()
+        alive = batch.alive.reshape(32, batch.rows, batch.cols).copy()
+        batch.step(rng.integers(8, size=32))
+
+        new = batch.shot_alive & (batch.shot_owner == OWNER_ALIEN) & ~before
+        for g, slot in zip(*np.nonzero(new)):
+            x, y = batch.shot_pos[g, slot] - origin[g] + (0, BULLET_OFFSET)
+            col = int(round(x / batch.spacing_x))
+            row = int(round(-y / batch.spacing_y))
+            assert alive[g, row, col] and not alive[g, row + 1:, col].any()
+
+        # The extents kept per game agree with a rescan of the aliens
+        grid = batch.alive.reshape(32, batch.rows, batch.cols)
+        assert np.array_equal(grid.sum(axis=1), batch.col_counts)
+        assert np.array_equal(grid.sum(axis=2), batch.row_counts)
+        assert np.array_equal(batch.alive.sum(axis=1), batch.remaining)
+        for g in range(32):
+            cols = np.flatnonzero(batch.col_counts[g])
+            assert (batch.first_col[g], batch.last_col[g]) == (cols[0], cols[-1])
+            assert batch.last_row[g] == np.flatnonzero(batch.row_counts[g])[-1]
+    assert not batch.bunkers.all()
+
+
+def test_vec_env_rewards_scores_and_resets_finished_games():
+    env = VecEnv(8, lives=1, seed=0)
+    obs = env.reset()
+    totals = np.zeros(8, dtype=np.int64)
+    finished = []
+    for _ in range(3000):
+        obs, rewards, dones, infos = env.step(env.sample_actions())
+        totals += rewards
+        for info in infos:
+            i = info["env"]
+            assert dones[i] and info["score"] == totals[i]
+            totals[i] = 0
+            # Already playing its next game
+            assert obs["player"][i, 1] == 1 and obs["aliens"][i].all()
+        finished += infos
+    assert finished
+    assert np.array_equal(totals, env.sim.score)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from invaders_core import (Formation, SpatialGrid, all_pairs_within, BULLET_HIT_RADIUS,
+                           PLAYER_HIT_RADIUS, SHOT_HIT_RADIUS, WIDTH, HEIGHT, MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+
+
+def pair_set(point_idx, item_idx):
+    return set(zip(point_idx.tolist(), item_idx.tolist()))
+
+
+@pytest.mark.parametrize("radius", [SHOT_HIT_RADIUS, BULLET_HIT_RADIUS, PLAYER_HIT_RADIUS])
+@pytest.mark.parametrize("rows, cols", [(5, 11), (MAX_ALIEN_ROWS, MAX_ALIEN_COLS)])
+def test_grid_finds_the_same_pairs_as_brute_force(rows, cols, radius):
+    rng = np.random.default_rng(rows * cols + radius)
+    formation = Formation(rows, cols)
+    items = np.sort(rng.choice(len(formation.pos), len(formation.pos) // 2, replace=False))
+    grid = SpatialGrid()
+    grid.build(formation.pos, items)
+    # Spread over the whole playfield and a little past it, where the grid clamps
+    points = rng.uniform((-WIDTH / 2 - 50, -HEIGHT / 2 - 50), (WIDTH / 2 + 50, HEIGHT / 2 + 50), (400, 2))
+    points[:100] = formation.pos[rng.choice(items, 100)] + rng.uniform(-radius, radius, (100, 2))
+
+    expected = pair_set(*all_pairs_within(points, formation.pos, items, radius))
+    assert expected
+    assert pair_set(*grid.pairs_within(points, radius)) == expected
+
+
+def test_grid_covering_a_layout_matches_brute_force():
+    rng = np.random.default_rng(0)
+    formation = Formation(MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+    everything = np.arange(len(formation.layout))
+    # Cells as small as the bullet radius, as Simulation builds it
+    grid = SpatialGrid.covering(formation.layout, BULLET_HIT_RADIUS)
+    grid.build(formation.layout, everything)
+    points = rng.uniform(formation.layout.min(axis=0) - 30, formation.layout.max(axis=0) + 30, (300, 2))
+    expected = pair_set(*all_pairs_within(points, formation.layout, everything, BULLET_HIT_RADIUS))
+    assert pair_set(*grid.pairs_within(points, BULLET_HIT_RADIUS)) == expected
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from invaders_core import (Formation, Simulation, WALL_X, INVASION_Y, BUNKER_Y, BUNKER_SIZE,
+                            ALIEN_MIN_SPACING, MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+
+BIGGEST = (MAX_ALIEN_ROWS, MAX_ALIEN_COLS)
+
+
+@pytest.mark.parametrize("rows, cols", [(5, 11), (5, 14), (10, 20), BIGGEST, (1, 1)])
+def test_formation_starts_between_the_walls_and_above_the_bunkers(rows, cols):
+    formation = Formation(rows, cols)
+    assert -WALL_X <= formation.left <= formation.right <= WALL_X
+    assert formation.bottom > BUNKER_Y + BUNKER_SIZE[1]
+    # Squeezed, but the aliens never overlap
+    assert min(formation.spacing_x, formation.spacing_y) >= ALIEN_MIN_SPACING
+
+
+def test_default_formation_keeps_its_classic_layout():
+    formation = Formation()
+    assert (formation.left, formation.right, formation.bottom) == (-250, 250, 40)
+
+
+@pytest.mark.parametrize("rows, cols", [(5, 14), BIGGEST])
+def test_large_formation_marches_without_bouncing_every_tick(rows, cols):
+    sim = Simulation(rows, cols, alien_fire_chance=0, seed=0)
+    formation = sim.formation
+    turns = 0
+    direction = formation.direction
+    for _ in range(300):
+        sim.step()
+        turns += formation.direction != direction
+        direction = formation.direction
+    # Crossing the playfield takes over a hundred ticks at the default speed
+    assert 1 <= turns <= 3
+    assert formation.bottom > INVASION_Y
+    assert not sim.game_over
+
+
+def test_formation_needs_at_least_one_alien():
+    with pytest.raises(ValueError):
+        Formation(0, 11)
+
+
+@pytest.mark.parametrize("rows, cols", [(MAX_ALIEN_ROWS + 1, 11), (5, MAX_ALIEN_COLS + 1), (50, 50)])
+def test_formation_too_big_for_the_playfield_is_rejected(rows, cols):
+    with pytest.raises(ValueError, match="does not fit"):
+        Formation(rows, cols)
+
+
+def brute_extents(formation):
+    grid = formation.alive.reshape(formation.rows, formation.cols)
+    cols = np.flatnonzero(grid.any(axis=0))
+    rows = np.flatnonzero(grid.any(axis=1))
+    return (formation.origin_x + cols[0] * formation.spacing_x,
+            formation.origin_x + cols[-1] * formation.spacing_x,
+            formation.origin_y - rows[-1] * formation.spacing_y)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_extents_follow_kills_in_any_order(seed):
+    formation = Formation(5, 11)
+    order = np.random.default_rng(seed).permutation(len(formation.alive))
+    for index in order[:-1]:
+        formation.kill(index)
+        assert (formation.left, formation.right, formation.bottom) == brute_extents(formation)
+        assert formation.remaining == formation.alive.sum()
+    formation.kill(order[-1])
+    assert formation.remaining == 0
+
+
+def test_emptying_an_edge_column_moves_the_wall_contact():
+    formation = Formation(5, 11)
+    for row in range(5):
+        formation.kill(row * 11 + 10)
+    assert formation.last_col == 9
+    assert formation.right == formation.origin_x + 9 * formation.spacing_x
+    # Killing aliens inside the block leaves the extents alone
+    formation.kill(2 * 11 + 5)
+    assert (formation.first_col, formation.last_col, formation.last_row) == (0, 9, 4)
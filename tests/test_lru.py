@@ -0,0 +1,29 @@
+from lru import LRUCache
+
+
+def test_keeps_the_most_recently_used():
+    cache = LRUCache(2)
+    made = []
+
+    def make(key):
+        return lambda: made.append(key) or key.upper()
+
+    assert cache.get("a", make("a")) == "A"
+    assert cache.get("b", make("b")) == "B"
+    assert cache.get("a", make("a")) == "A"  # now "b" is the oldest
+    cache.get("c", make("c"))
+
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert made == ["a", "b", "c"]
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_clear_forgets_values_but_not_counts():
+    cache = LRUCache(4)
+    cache.get(1, lambda: "one")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get(1, lambda: "uno") == "uno"
+    assert cache.misses == 2
@@ -0,0 +1,56 @@
+import pytest
+
+from invaders_core import INPUT_FIRE, INPUT_LEFT, INPUT_RIGHT
+from invaders_replay import Recording, ReplayMismatch, replay, state_checksum
+
+RESTARTS = (150, 400)
+
+
+def sweep(tick):
+    return INPUT_FIRE | (INPUT_LEFT if (tick // 45) % 2 else INPUT_RIGHT)
+
+
+def play(seed=7, ticks=700):
+    """Record a session with restarts the way the front-end does; return it and the final state"""
+    recording = Recording(seed)
+    sim = recording.simulation()
+    for tick in range(ticks):
+        if tick in RESTARTS:
+            recording.restart()
+            sim.reset()
+        sim.step(sweep(tick))
+        recording.record(sweep(tick), sim)
+    # A restart after the last tick is part of the session too
+    recording.restart()
+    sim.reset()
+    return recording, sim
+
+
+def test_save_load_round_trip(tmp_path):
+    recording, _ = play()
+    path = tmp_path / "game.sirp"
+    recording.save(path)
+    loaded = Recording.load(path)
+    assert (loaded.seed, loaded.rows, loaded.cols, loaded.interval) == (7, 5, 11, recording.interval)
+    assert loaded.inputs == recording.inputs
+    assert loaded.restarts == [*RESTARTS, 700]
+    assert loaded.checksums == recording.checksums
+
+
+def test_replay_reproduces_the_session(tmp_path):
+    recording, sim = play()
+    path = tmp_path / "game.sirp"
+    recording.save(path)
+    assert state_checksum(replay(Recording.load(path))) == state_checksum(sim)
+
+
+def test_replay_spots_a_changed_input(tmp_path):
+    recording, _ = play()
+    recording.inputs[200] ^= INPUT_LEFT | INPUT_RIGHT
+    with pytest.raises(ReplayMismatch):
+        replay(recording)
+
+
+def test_seed_must_fit_the_header():
+    with pytest.raises(ValueError):
+        Recording(2**32)
@@ -0,0 +1,28 @@
+from invaders_core import Rewind, Simulation, INPUT_FIRE, INPUT_RIGHT
+from invaders_replay import state_checksum
+
+
+def test_rewind_restores_each_recorded_state():
+    sim = Simulation(seed=3)
+    rewind = Rewind(sim, seconds=1)
+    checksums = []
+    # Run past the capacity so the ring buffer has wrapped
+    for tick in range(rewind.capacity + 45):
+        sim.step(INPUT_FIRE | (INPUT_RIGHT if tick % 60 < 30 else 0))
+        rewind.snapshot()
+        checksums.append(state_checksum(sim))
+
+    steps = 0
+    while rewind.rewind():
+        steps += 1
+        assert state_checksum(sim) == checksums[-1 - steps]
+    assert steps == rewind.capacity - 1
+
+
+def test_rewind_needs_an_older_snapshot():
+    sim = Simulation(seed=3)
+    rewind = Rewind(sim)
+    rewind.snapshot()
+    assert not rewind.rewind()
+    rewind.clear()
+    assert not rewind.rewind()
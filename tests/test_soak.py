@@ -0,0 +1,18 @@
+import tkinter
+
+import pytest
+
+
+def has_display():
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not has_display(), reason="the turtle view needs a display")
+def test_restarts_leave_turtles_canvas_and_memory_flat(capsys):
+    import main
+
+    assert main.soak(30, frames_per_game=60), capsys.readouterr().out